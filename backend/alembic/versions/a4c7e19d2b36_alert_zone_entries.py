@@ -0,0 +1,72 @@
+"""alert zone entries
+
+Revision ID: a4c7e19d2b36
+Revises: f1b6d8e40a27
+Create Date: 2026-10-16 20:45:12.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a4c7e19d2b36'
+down_revision = 'f1b6d8e40a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('alerts', sa.Column('zone_id', sa.Integer(), nullable=True))
+    op.add_column('alerts', sa.Column('exited_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        'alerts_zone_id_fkey', 'alerts', 'restricted_zones', ['zone_id'], ['id'], ondelete='SET NULL'
+    )
+    # Unresolved zone alerts from before this revision become open entries of the zone
+    # they were raised in, so drones already inside don't alert again after deploy.
+    # An alert inside overlapping zones takes the nearest one; per drone and zone only
+    # the newest alert is kept open, the rest keep no zone_id.
+    op.execute(
+        """
+        UPDATE alerts SET zone_id = entries.zone_id
+        FROM (
+            SELECT DISTINCT ON (drone_id, zone_id) alert_id, zone_id
+            FROM (
+                SELECT DISTINCT ON (a.id) a.id AS alert_id, a.drone_id, a.created_at, z.id AS zone_id
+                FROM alerts a
+                JOIN restricted_zones z ON ST_DWithin(
+                    ST_SetSRID(ST_MakePoint(a.longitude, a.latitude), 4326)::geography,
+                    ST_SetSRID(ST_MakePoint(z.center_lng, z.center_lat), 4326)::geography,
+                    z.radius
+                )
+                WHERE a.alert_type = 'restricted_zone_violation'
+                AND a.is_resolved IS NOT TRUE
+                AND a.latitude IS NOT NULL AND a.longitude IS NOT NULL
+                AND z.is_active
+                ORDER BY a.id, ST_Distance(
+                    ST_SetSRID(ST_MakePoint(a.longitude, a.latitude), 4326)::geography,
+                    ST_SetSRID(ST_MakePoint(z.center_lng, z.center_lat), 4326)::geography
+                )
+            ) AS matched
+            ORDER BY drone_id, zone_id, created_at DESC, alert_id DESC
+        ) AS entries
+        WHERE alerts.id = entries.alert_id
+        """
+    )
+    # Restricted zone membership shared by all workers: a drone is inside a zone while
+    # its alert for that zone has no exited_at
+    op.create_index(
+        'uq_alerts_open_zone_entry',
+        'alerts',
+        ['drone_id', 'zone_id'],
+        unique=True,
+        postgresql_where=sa.text(
+            "alert_type = 'restricted_zone_violation' AND exited_at IS NULL AND zone_id IS NOT NULL"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_alerts_open_zone_entry', table_name='alerts')
+    op.drop_constraint('alerts_zone_id_fkey', 'alerts', type_='foreignkey')
+    op.drop_column('alerts', 'exited_at')
+    op.drop_column('alerts', 'zone_id')
@@ -0,0 +1,28 @@
+"""telemetry rollup retention index
+
+Revision ID: b82d5f0c6e13
+Revises: a4c7e19d2b36
+Create Date: 2026-10-16 21:38:07.552190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b82d5f0c6e13'
+down_revision = 'a4c7e19d2b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rollup retention deletes the oldest buckets of one resolution at a time
+    op.create_index(
+        'ix_telemetry_rollups_resolution_bucket',
+        'telemetry_rollups',
+        ['resolution_seconds', 'bucket_start']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_telemetry_rollups_resolution_bucket', table_name='telemetry_rollups')
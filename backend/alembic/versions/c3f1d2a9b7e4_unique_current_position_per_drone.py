@@ -0,0 +1,32 @@
+"""unique current position per drone
+
+Revision ID: c3f1d2a9b7e4
+Revises: 41a0ba4ccbf2
+Create Date: 2026-10-16 10:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1d2a9b7e4'
+down_revision = '41a0ba4ccbf2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the newest row per drone before enforcing uniqueness
+    op.execute("""
+        DELETE FROM current_drone_positions cp
+        USING current_drone_positions newer
+        WHERE cp.drone_id = newer.drone_id
+        AND cp.id < newer.id
+    """)
+    op.create_unique_constraint('uq_current_drone_positions_drone_id', 'current_drone_positions', ['drone_id'])
+    op.add_column('current_drone_positions', sa.Column('previous_hex_cell_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('current_drone_positions', 'previous_hex_cell_id')
+    op.drop_constraint('uq_current_drone_positions_drone_id', 'current_drone_positions', type_='unique')
@@ -0,0 +1,103 @@
+"""partition telemetry_data by timestamp
+
+Revision ID: d7e2b4c81f05
+Revises: c3f1d2a9b7e4
+Create Date: 2026-10-16 14:31:07.502114
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd7e2b4c81f05'
+down_revision = 'c3f1d2a9b7e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Move the heap aside, keeping its id sequence for the new table
+    op.execute("ALTER TABLE telemetry_data RENAME TO telemetry_data_legacy")
+    op.execute("ALTER INDEX IF EXISTS telemetry_data_pkey RENAME TO telemetry_data_legacy_pkey")
+    op.execute("ALTER INDEX IF EXISTS ix_telemetry_data_id RENAME TO ix_telemetry_data_legacy_id")
+
+    op.execute("""
+        CREATE TABLE telemetry_data (
+            id INTEGER NOT NULL DEFAULT nextval('telemetry_data_id_seq'),
+            drone_id INTEGER NOT NULL REFERENCES drones (id),
+            flight_request_id INTEGER REFERENCES flight_requests (id),
+            latitude FLOAT NOT NULL,
+            longitude FLOAT NOT NULL,
+            altitude FLOAT NOT NULL,
+            speed FLOAT,
+            heading FLOAT,
+            battery_level FLOAT,
+            status VARCHAR,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE INDEX ix_telemetry_data_id ON telemetry_data (id)")
+    op.execute("CREATE INDEX ix_telemetry_data_drone_id_timestamp ON telemetry_data (drone_id, timestamp)")
+
+    # Daily UTC partitions covering existing rows through three days ahead; the
+    # partition manager continues from the last upper bound at startup
+    op.execute("""
+        DO $$
+        DECLARE
+            day date;
+        BEGIN
+            FOR day IN
+                SELECT generate_series(
+                    COALESCE((SELECT min(timestamp) FROM telemetry_data_legacy), now()) AT TIME ZONE 'UTC',
+                    (now() + interval '3 days') AT TIME ZONE 'UTC',
+                    interval '1 day'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF telemetry_data FOR VALUES FROM (%L) TO (%L)',
+                    'telemetry_data_p' || to_char(day, 'YYYYMMDD'),
+                    day::timestamp AT TIME ZONE 'UTC',
+                    (day + 1)::timestamp AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute("""
+        INSERT INTO telemetry_data (
+            id, drone_id, flight_request_id, latitude, longitude, altitude,
+            speed, heading, battery_level, status, timestamp
+        )
+        SELECT id, drone_id, flight_request_id, latitude, longitude, altitude,
+               speed, heading, battery_level, status, COALESCE(timestamp, now())
+        FROM telemetry_data_legacy
+    """)
+    op.execute("ALTER SEQUENCE telemetry_data_id_seq OWNED BY telemetry_data.id")
+    op.execute("DROP TABLE telemetry_data_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE telemetry_data RENAME TO telemetry_data_partitioned")
+    op.execute("ALTER INDEX ix_telemetry_data_id RENAME TO ix_telemetry_data_partitioned_id")
+    op.execute("ALTER INDEX ix_telemetry_data_drone_id_timestamp RENAME TO ix_telemetry_data_partitioned_drone_id_timestamp")
+
+    op.execute("""
+        CREATE TABLE telemetry_data (
+            id INTEGER NOT NULL DEFAULT nextval('telemetry_data_id_seq') PRIMARY KEY,
+            drone_id INTEGER NOT NULL REFERENCES drones (id),
+            flight_request_id INTEGER REFERENCES flight_requests (id),
+            latitude FLOAT NOT NULL,
+            longitude FLOAT NOT NULL,
+            altitude FLOAT NOT NULL,
+            speed FLOAT,
+            heading FLOAT,
+            battery_level FLOAT,
+            status VARCHAR,
+            timestamp TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX ix_telemetry_data_id ON telemetry_data (id)")
+    op.execute("INSERT INTO telemetry_data SELECT * FROM telemetry_data_partitioned")
+    op.execute("ALTER SEQUENCE telemetry_data_id_seq OWNED BY telemetry_data.id")
+    # Drops every partition along with the parent
+    op.execute("DROP TABLE telemetry_data_partitioned")
@@ -0,0 +1,51 @@
+"""add telemetry rollups
+
+Revision ID: e5a9c3f27b18
+Revises: d7e2b4c81f05
+Create Date: 2026-10-16 16:05:44.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c3f27b18'
+down_revision = 'd7e2b4c81f05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'telemetry_rollups',
+        sa.Column('drone_id', sa.Integer(), sa.ForeignKey('drones.id'), nullable=False),
+        sa.Column('resolution_seconds', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('mean_latitude', sa.Float(), nullable=False),
+        sa.Column('mean_longitude', sa.Float(), nullable=False),
+        sa.Column('last_latitude', sa.Float(), nullable=False),
+        sa.Column('last_longitude', sa.Float(), nullable=False),
+        sa.Column('min_altitude', sa.Float(), nullable=False),
+        sa.Column('max_altitude', sa.Float(), nullable=False),
+        sa.Column('mean_speed', sa.Float(), nullable=True),
+        sa.Column('min_battery_level', sa.Float(), nullable=True),
+        sa.Column('last_status', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('drone_id', 'resolution_seconds', 'bucket_start')
+    )
+    op.create_table(
+        'telemetry_rollup_watermarks',
+        sa.Column('resolution_seconds', sa.Integer(), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('resolution_seconds')
+    )
+    op.create_index(
+        'ix_telemetry_data_timestamp_brin', 'telemetry_data', ['timestamp'], postgresql_using='brin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_telemetry_data_timestamp_brin', table_name='telemetry_data')
+    op.drop_table('telemetry_rollup_watermarks')
+    op.drop_table('telemetry_rollups')
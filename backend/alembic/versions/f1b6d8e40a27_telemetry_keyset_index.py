@@ -0,0 +1,30 @@
+"""telemetry keyset index
+
+Revision ID: f1b6d8e40a27
+Revises: e5a9c3f27b18
+Create Date: 2026-10-16 17:22:19.604813
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6d8e40a27'
+down_revision = 'e5a9c3f27b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the newest-first (timestamp, id) keyset order of the history endpoint
+    op.create_index(
+        'ix_telemetry_data_drone_id_timestamp_id',
+        'telemetry_data',
+        ['drone_id', sa.text('timestamp DESC'), sa.text('id DESC')]
+    )
+    op.drop_index('ix_telemetry_data_drone_id_timestamp', table_name='telemetry_data')
+
+
+def downgrade() -> None:
+    op.create_index('ix_telemetry_data_drone_id_timestamp', 'telemetry_data', ['drone_id', 'timestamp'])
+    op.drop_index('ix_telemetry_data_drone_id_timestamp_id', table_name='telemetry_data')
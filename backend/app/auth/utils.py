@@ -50,6 +50,20 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     return user
 
 
+async def get_user_from_token(token: str, db: AsyncSession):
+    """Resolve a bearer token to its user, or None if the token is invalid"""
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+        email: str = payload.get("sub")
+        if email is None:
+            return None
+        token_data = TokenData(email=email)
+    except JWTError:
+        return None
+
+    return await get_user_by_email(db, email=token_data.email)
+
+
 async def get_current_user(
         credentials: HTTPAuthorizationCredentials = Depends(security),
         db: AsyncSession = Depends(get_db)
@@ -59,16 +73,7 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.jwt_algorithm])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-
-    user = await get_user_by_email(db, email=token_data.email)
+    user = await get_user_from_token(credentials.credentials, db)
     if user is None:
         raise credentials_exception
     return user
@@ -10,6 +10,76 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256")
     access_token_expire_minutes: int = Field(default=30)
 
+    # Telemetry ingest
+    telemetry_batch_max_size: int = Field(default=5000)
+    # Samples carry device time; older than the lateness bound or ahead of server time by
+    # more than the skew allowance they are rejected
+    telemetry_max_lateness_seconds: int = Field(default=300)
+    telemetry_max_clock_skew_seconds: int = Field(default=5)
+    # Bounded ingest queue: coalesce per drone past the soft limit, 429 past the hard limit
+    ingest_queue_soft_limit: int = Field(default=5000)
+    ingest_queue_hard_limit: int = Field(default=20000)
+    ingest_queue_workers: int = Field(default=4)
+    ingest_queue_batch_size: int = Field(default=500)
+    ingest_retry_after_seconds: int = Field(default=1)
+    # Frames of one ingest WebSocket processed concurrently; past this the socket isn't read
+    ingest_ws_max_in_flight_frames: int = Field(default=256)
+    # Dead band: store a history row only when the drone moved, changed altitude or
+    # status, or nothing was stored for the max interval (device time). Current position
+    # always updates. Off by default, since it changes which history rows are kept.
+    telemetry_deadband_enabled: bool = Field(default=False)
+    telemetry_deadband_distance_m: float = Field(default=5.0)
+    telemetry_deadband_altitude_m: float = Field(default=2.0)
+    telemetry_deadband_max_interval_seconds: float = Field(default=30.0)
+    # Write-behind mode queues telemetry history and COPYs it in the background
+    telemetry_write_behind: bool = Field(default=False)
+    telemetry_flush_rows: int = Field(default=1000)
+    telemetry_flush_interval_ms: int = Field(default=250)
+    telemetry_buffer_max_rows: int = Field(default=100000)
+
+    # telemetry_data is range partitioned by timestamp; expired partitions are dropped whole
+    telemetry_partition_days: int = Field(default=1)
+    telemetry_partition_premake: int = Field(default=3)
+    telemetry_retention_days: int = Field(default=30)
+    telemetry_partition_maintenance_interval_seconds: int = Field(default=3600)
+
+    # Rollups of telemetry history into coarser per-drone buckets
+    telemetry_rollup_interval_seconds: int = Field(default=30)
+    # Slack on top of telemetry_max_lateness_seconds and the write-behind flush interval
+    # before a bucket is closed, so every late sample that is accepted still makes it in
+    telemetry_rollup_lag_seconds: int = Field(default=30)
+    telemetry_rollup_chunk_seconds: int = Field(default=3600)  # source window per statement
+    # Rollup buckets are deleted once older than their resolution's retention. Keep 10 s
+    # rollups as long as raw history so history windows that pick them have no gap.
+    telemetry_rollup_retention_days_10s: int = Field(default=30)
+    telemetry_rollup_retention_days_60s: int = Field(default=365)
+    telemetry_rollup_retention_interval_seconds: int = Field(default=3600)
+    telemetry_rollup_delete_batch: int = Field(default=10000)  # rows per DELETE statement
+
+    # Airspace WebSocket frames are pushed from ingest, coalesced to this rate
+    airspace_max_frame_rate: float = Field(default=10.0)
+    # Full snapshot sent to delta mode viewers this often so they converge after a miss
+    airspace_keyframe_interval_seconds: int = Field(default=30)
+    # Per-viewer outbound queue (messages); a viewer that overflows it is downgraded to snapshots
+    websocket_send_queue_size: int = Field(default=64)
+    # A viewer whose socket accepts nothing for this long is disconnected
+    websocket_send_timeout_seconds: float = Field(default=10.0)
+
+    # Positions and WebSocket messages are relayed to the other workers over LISTEN/NOTIFY,
+    # batched every interval
+    airspace_notify_enabled: bool = Field(default=True)
+    airspace_notify_channel: str = Field(default="utm_airspace")
+    airspace_notify_interval_ms: int = Field(default=100)
+
+    # Hex occupancy
+    hex_count_reconcile_interval_seconds: int = Field(default=300)
+
+    # Janitor: grounded drones' positions are evicted once older than the max age;
+    # job intervals vary by +- the jitter fraction
+    stale_position_eviction_interval_seconds: int = Field(default=60)
+    stale_position_max_age_seconds: int = Field(default=300)
+    janitor_jitter_fraction: float = Field(default=0.1)
+
     class Config:
         env_file = ".env"
 
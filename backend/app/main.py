@@ -8,8 +8,14 @@ from .database import init_db
 from .auth.router import router as auth_router
 from .drones.router import router as drones_router
 from .flights.router import router as flights_router
-from .monitoring.router import router as monitoring_router
+from .monitoring.router import router as monitoring_router, airspace_broadcaster
 from .monitoring.telemetry import telemetry_generator
+from .monitoring.hex_index import hex_index
+from .monitoring.zones import zone_monitor
+from .monitoring.write_behind import telemetry_buffer
+from .monitoring.ingest_queue import ingest_queue
+from .monitoring.janitor import janitor
+from .monitoring.notify import airspace_events
 from .utils.logger import setup_logger
 from .monitoring.scripts.populate_hex_grid import router as populate_hex_grid_router
 # Set up application logger
@@ -22,6 +28,31 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized.")
 
+    # telemetry_data rows need a partition to land in before ingest starts
+    await janitor.run_job("telemetry_partitions", wait=True)
+
+    # Load the H3 index -> hex cell lookup used by telemetry ingest
+    await hex_index.load()
+
+    # Drones already inside restricted zones, so a restart doesn't alert for them again
+    await zone_monitor.load()
+
+    # Bounded worker pool behind the telemetry ingest endpoints
+    ingest_queue.start()
+
+    if telemetry_buffer.enabled:
+        telemetry_buffer.start()
+
+    # One shared frame builder for all airspace WebSocket viewers
+    asyncio.create_task(airspace_broadcaster.start())
+
+    # Relay positions and WebSocket messages between uvicorn workers
+    asyncio.create_task(airspace_events.start())
+
+    # Housekeeping: stale position eviction, hex count reconciliation,
+    # partition retention and telemetry rollups, each run by one worker at a time
+    asyncio.create_task(janitor.start())
+
     # Start telemetry generator
     logger.info("Starting telemetry generator...")
     asyncio.create_task(telemetry_generator.start())
@@ -32,6 +63,16 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Stopping telemetry generator...")
     telemetry_generator.stop()
+    janitor.stop()
+    airspace_broadcaster.stop()
+    airspace_events.stop()
+
+    # Finish queued samples first so their history reaches the write buffer
+    await ingest_queue.stop()
+
+    # Drain buffered telemetry history before the process exits
+    if telemetry_buffer.enabled:
+        await telemetry_buffer.stop()
     logger.info("Application shutdown complete.")
 
 app = FastAPI(lifespan=lifespan)
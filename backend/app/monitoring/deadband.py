@@ -0,0 +1,93 @@
+# app/monitoring/deadband.py
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from ..config import settings
+from .schemas import TelemetryDataCreate
+from ..utils.geospatial import haversine_distance
+
+
+class _StoredSample(NamedTuple):
+    latitude: float
+    longitude: float
+    altitude: float
+    status: Optional[str]
+    stored_at: datetime  # device timestamp of the stored sample
+
+
+class TelemetryDeadband:
+    """
+    Per-drone dead band for telemetry history.
+
+    A sample is stored when it is the first for its drone, its status changed,
+    it moved more than distance_m horizontally or altitude_m vertically from the
+    last stored sample, or max_interval_seconds passed since that sample.
+    Everything else only updates the drone's current position. The interval is
+    measured in device time, so a buffered batch covering minutes of flight
+    still keeps one row per interval.
+    """
+
+    def __init__(self, distance_m: float, altitude_m: float, max_interval_seconds: float):
+        self.distance_m = distance_m
+        self.altitude_m = altitude_m
+        self.max_interval_seconds = max_interval_seconds
+        self._last_stored: Dict[int, _StoredSample] = {}
+
+        self.received = 0
+        self.stored = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.telemetry_deadband_enabled
+
+    def _outside_band(self, sample: TelemetryDataCreate, last: Optional[_StoredSample]) -> bool:
+        if last is None or sample.status != last.status:
+            return True
+        if (sample.timestamp - last.stored_at).total_seconds() >= self.max_interval_seconds:
+            return True
+        if abs(sample.altitude - last.altitude) > self.altitude_m:
+            return True
+        return haversine_distance(last.latitude, last.longitude, sample.latitude, sample.longitude) > self.distance_m
+
+    def select(self, samples: Sequence[TelemetryDataCreate]) -> List[bool]:
+        """
+        Decide which samples to store, in order. Samples earlier in the batch count
+        as stored for later ones, but drone state only advances on commit().
+        """
+        pending: Dict[int, _StoredSample] = {}
+        decisions = []
+        for sample in samples:
+            last = pending.get(sample.drone_id) or self._last_stored.get(sample.drone_id)
+            store = not self.enabled or self._outside_band(sample, last)
+            if store:
+                pending[sample.drone_id] = _StoredSample(
+                    sample.latitude, sample.longitude, sample.altitude, sample.status, sample.timestamp
+                )
+            decisions.append(store)
+        return decisions
+
+    def commit(self, samples: Sequence[TelemetryDataCreate], decisions: Sequence[bool]):
+        """Record the outcome of select() once the batch has been persisted"""
+        for sample, store in zip(samples, decisions):
+            if store:
+                self._last_stored[sample.drone_id] = _StoredSample(
+                    sample.latitude, sample.longitude, sample.altitude, sample.status, sample.timestamp
+                )
+        self.received += len(decisions)
+        self.stored += sum(decisions)
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "received": self.received,
+            "stored": self.stored,
+            "stored_ratio": self.stored / self.received if self.received else 1.0,
+            "tracked_drones": len(self._last_stored)
+        }
+
+
+telemetry_deadband = TelemetryDeadband(
+    distance_m=settings.telemetry_deadband_distance_m,
+    altitude_m=settings.telemetry_deadband_altitude_m,
+    max_interval_seconds=settings.telemetry_deadband_max_interval_seconds
+)
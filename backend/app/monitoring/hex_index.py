@@ -0,0 +1,101 @@
+# app/monitoring/hex_index.py
+import sys
+import time
+import asyncio
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Set
+from sqlalchemy import select
+
+from ..database import AsyncSessionLocal
+from .models import HexGridCell
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.hex_index")
+
+
+class HexCellRef(NamedTuple):
+    id: int
+    center_lat: float
+    center_lng: float
+
+
+class HexCellIndex:
+    """
+    Process-wide read-only map from H3 index to hex grid cell.
+
+    hex_grid_cells is static once populate_hex_grid has run, so the ingest path
+    resolves cells with a dict lookup instead of a SELECT per sample. A reload
+    builds a fresh mapping and swaps it in with a single assignment, so readers
+    never see a partially loaded table.
+    """
+
+    def __init__(self):
+        self._cells: Mapping[str, HexCellRef] = MappingProxyType({})
+        self.loaded_at: Optional[datetime] = None
+        self.load_time_ms = 0.0
+        self.memory_bytes = 0
+        self.lock = asyncio.Lock()
+        # Background reloads in flight, referenced so they aren't garbage collected
+        self._reloads: Set[asyncio.Task] = set()
+
+    async def load(self):
+        """Load (or reload) all hex cells from the database"""
+        async with self.lock:
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(HexGridCell.h3_index, HexGridCell.id, HexGridCell.center_lat, HexGridCell.center_lng)
+                )
+                cells = {
+                    h3_index: HexCellRef(cell_id, center_lat, center_lng)
+                    for h3_index, cell_id, center_lat, center_lng in result.all()
+                }
+
+            self._cells = MappingProxyType(cells)
+            self.load_time_ms = (time.perf_counter() - start) * 1000
+            self.memory_bytes = self._estimate_memory(cells)
+            self.loaded_at = datetime.utcnow()
+            logger.info(f"Loaded hex cell index: {len(cells)} cells in {self.load_time_ms:.1f}ms")
+
+    def reload_in_background(self):
+        """Schedule load() without waiting for it; a failure is logged"""
+        task = asyncio.create_task(self.load())
+        self._reloads.add(task)
+        task.add_done_callback(self._reload_done)
+
+    def _reload_done(self, task: asyncio.Task):
+        self._reloads.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error reloading hex cell index: {task.exception()}", exc_info=task.exception())
+
+    def add(self, h3_index: str, cell: HexCellRef):
+        """Add one cell created after the last load, swapping in a copy of the mapping"""
+        cells = dict(self._cells)
+        cells[h3_index] = cell
+        self._cells = MappingProxyType(cells)
+
+    @staticmethod
+    def _estimate_memory(cells: dict) -> int:
+        size = sys.getsizeof(cells)
+        for h3_index, cell in cells.items():
+            size += sys.getsizeof(h3_index) + sys.getsizeof(cell)
+            size += sum(sys.getsizeof(value) for value in cell)
+        return size
+
+    def lookup(self, h3_index: str) -> Optional[HexCellRef]:
+        return self._cells.get(h3_index)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def get_stats(self):
+        return {
+            "cells": len(self._cells),
+            "memory_bytes": self.memory_bytes,
+            "load_time_ms": self.load_time_ms,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None
+        }
+
+
+hex_index = HexCellIndex()
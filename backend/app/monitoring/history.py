@@ -0,0 +1,95 @@
+# app/monitoring/history.py
+import base64
+from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy import select, and_, desc, tuple_
+from sqlalchemy.sql import Select
+
+from ..database import AsyncSessionLocal
+from .models import TelemetryData, TelemetryRollup
+from .schemas import TelemetryData as TelemetryDataSchema, TelemetryRollup as TelemetryRollupSchema
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_FETCH_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for the (timestamp, id) position of the last row returned"""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def telemetry_history_query(
+    drone_id: int,
+    since: datetime,
+    resolution: int = 0,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Select:
+    """
+    Newest-first history for one drone: raw rows for resolution 0, otherwise rollup
+    buckets. Paging continues strictly after the cursor position, which the
+    (drone_id, timestamp DESC, id DESC) index serves without an offset scan.
+    Rollup buckets are unique per drone and resolution, so their cursor id is 0.
+    """
+    after = decode_cursor(cursor) if cursor else None
+
+    if resolution:
+        conditions = [
+            TelemetryRollup.drone_id == drone_id,
+            TelemetryRollup.resolution_seconds == resolution,
+            TelemetryRollup.bucket_start > since
+        ]
+        if after:
+            conditions.append(TelemetryRollup.bucket_start < after[0])
+        query = select(TelemetryRollup).filter(and_(*conditions)).order_by(desc(TelemetryRollup.bucket_start))
+    else:
+        conditions = [
+            TelemetryData.drone_id == drone_id,
+            TelemetryData.timestamp > since
+        ]
+        if after:
+            conditions.append(tuple_(TelemetryData.timestamp, TelemetryData.id) < after)
+        query = (
+            select(TelemetryData)
+            .filter(and_(*conditions))
+            .order_by(desc(TelemetryData.timestamp), desc(TelemetryData.id))
+        )
+
+    return query.limit(limit) if limit else query
+
+
+def history_cursor(row) -> str:
+    """Cursor pointing just past a TelemetryData or TelemetryRollup row"""
+    if isinstance(row, TelemetryRollup):
+        return encode_cursor(row.bucket_start, 0)
+    return encode_cursor(row.timestamp, row.id)
+
+
+def history_schema(row):
+    if isinstance(row, TelemetryRollup):
+        return TelemetryRollupSchema.model_validate(row)
+    return TelemetryDataSchema.model_validate(row)
+
+
+async def stream_history_ndjson(query: Select) -> AsyncIterator[bytes]:
+    """
+    Yield query results as newline-delimited JSON from a server-side cursor.
+    Uses its own session since the request's session may be closed before the
+    response body is fully sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(query.execution_options(yield_per=STREAM_FETCH_SIZE))
+        async for rows in result.partitions():
+            yield b"".join(history_schema(row).model_dump_json().encode() + b"\n" for row in rows)
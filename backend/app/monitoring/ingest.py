@@ -0,0 +1,355 @@
+# app/monitoring/ingest.py
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, text
+import h3
+
+from ..config import settings
+from ..drones.models import Drone
+from ..flights.models import FlightRequest
+from .models import TelemetryData
+from .hex_index import hex_index
+from .occupancy import apply_hex_count_deltas, hex_count_deltas
+from .write_behind import telemetry_buffer
+from .deadband import telemetry_deadband
+from .position_bus import position_bus, PositionUpdate
+from .notify import airspace_events
+from .zones import zone_monitor
+from .schemas import TelemetryDataCreate, TelemetryBatchItemResult, TelemetryBatchResult
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.ingest")
+
+HEX_RESOLUTION = 8
+
+# Ids are int4 columns; a bigger value would fail the statement for the whole batch
+MAX_ID = 2 ** 31 - 1
+
+# Insert-or-update every drone's current position in one statement. Rows are
+# passed as parallel arrays and expanded with unnest, so the parameter count stays
+# fixed regardless of batch size, and written in drone_id order so concurrent
+# batches lock overlapping drones in the same order. On conflict the existing
+# row's cell is copied into previous_hex_cell_id (NULL for inserts), which
+# apply_hex_count_deltas turns into hex occupancy changes. last_update is the
+# sample's device time, and a sample older than the stored position is skipped
+# by the WHERE guard, so late data never regresses a drone.
+UPSERT_CURRENT_POSITIONS = text("""
+    INSERT INTO current_drone_positions (
+        drone_id, flight_request_id, hex_cell_id, latitude, longitude, altitude,
+        speed, heading, battery_level, status, last_update
+    )
+    SELECT incoming.*
+    FROM unnest(
+        CAST(:drone_ids AS integer[]),
+        CAST(:flight_request_ids AS integer[]),
+        CAST(:hex_cell_ids AS integer[]),
+        CAST(:latitudes AS double precision[]),
+        CAST(:longitudes AS double precision[]),
+        CAST(:altitudes AS double precision[]),
+        CAST(:speeds AS double precision[]),
+        CAST(:headings AS double precision[]),
+        CAST(:battery_levels AS double precision[]),
+        CAST(:statuses AS varchar[]),
+        CAST(:timestamps AS timestamptz[])
+    ) AS incoming
+    ORDER BY 1
+    ON CONFLICT (drone_id) DO UPDATE SET
+        previous_hex_cell_id = current_drone_positions.hex_cell_id,
+        hex_cell_id = EXCLUDED.hex_cell_id,
+        flight_request_id = EXCLUDED.flight_request_id,
+        latitude = EXCLUDED.latitude,
+        longitude = EXCLUDED.longitude,
+        altitude = EXCLUDED.altitude,
+        speed = EXCLUDED.speed,
+        heading = EXCLUDED.heading,
+        battery_level = EXCLUDED.battery_level,
+        status = EXCLUDED.status,
+        last_update = EXCLUDED.last_update
+    WHERE current_drone_positions.last_update IS NULL
+    OR current_drone_positions.last_update <= EXCLUDED.last_update
+    RETURNING drone_id, hex_cell_id, previous_hex_cell_id
+""")
+
+
+class PositionWatermarks:
+    """
+    Newest device timestamp applied to each drone's current position.
+
+    Samples at or behind a drone's watermark are late: they still go to history
+    but are not offered to the current position upsert. The watermark only moves
+    once a batch has committed; the upsert's last_update guard covers races
+    between concurrent batches.
+    """
+
+    def __init__(self):
+        self._watermarks: Dict[int, datetime] = {}
+        self.late_samples = 0
+        self.too_late_samples = 0
+        self.future_samples = 0
+
+    def is_late(self, sample: TelemetryDataCreate) -> bool:
+        watermark = self._watermarks.get(sample.drone_id)
+        return watermark is not None and sample.timestamp <= watermark
+
+    def advance(self, samples: Iterable[TelemetryDataCreate]):
+        for sample in samples:
+            watermark = self._watermarks.get(sample.drone_id)
+            if watermark is None or sample.timestamp > watermark:
+                self._watermarks[sample.drone_id] = sample.timestamp
+
+    def get_stats(self):
+        return {
+            "tracked_drones": len(self._watermarks),
+            "late_samples": self.late_samples,
+            "too_late_samples": self.too_late_samples,
+            "future_samples": self.future_samples
+        }
+
+
+position_watermarks = PositionWatermarks()
+
+
+def reject_sample(index: int, error: str, retryable: bool = False) -> TelemetryBatchItemResult:
+    return TelemetryBatchItemResult(index=index, accepted=False, retryable=retryable, error=error)
+
+
+def validate_telemetry_samples(
+    raw_samples: List[Any]
+) -> Tuple[List[Tuple[int, TelemetryDataCreate]], List[Optional[TelemetryBatchItemResult]]]:
+    """
+    Validate each sample on its own so one bad record doesn't reject the batch.
+    Values the database would refuse (ids out of int4 range, NUL in strings) are
+    rejected here, since later they would fail everyone's samples.
+
+    Samples without a device timestamp get the receive time; naive timestamps
+    are taken as UTC. Samples beyond the lateness bound or too far in the future
+    are rejected. Returns the valid (index, sample) pairs and a result slot per
+    input, filled for rejects. Run once per sample, at receive time.
+    """
+    received_at = datetime.now(timezone.utc)
+    oldest = received_at - timedelta(seconds=settings.telemetry_max_lateness_seconds)
+    newest = received_at + timedelta(seconds=settings.telemetry_max_clock_skew_seconds)
+
+    results: List[Optional[TelemetryBatchItemResult]] = [None] * len(raw_samples)
+    samples: List[Tuple[int, TelemetryDataCreate]] = []
+    for index, raw in enumerate(raw_samples):
+        try:
+            sample = raw if isinstance(raw, TelemetryDataCreate) else TelemetryDataCreate.model_validate(raw)
+        except ValidationError as e:
+            results[index] = reject_sample(index, f"Invalid telemetry sample: {e.errors()[0]['msg']}")
+            continue
+
+        if not 0 < sample.drone_id <= MAX_ID or (
+                sample.flight_request_id is not None and not 0 < sample.flight_request_id <= MAX_ID):
+            results[index] = reject_sample(index, "drone_id and flight_request_id must be between 1 and 2147483647")
+            continue
+        if sample.status is not None and "\x00" in sample.status:
+            results[index] = reject_sample(index, "status must not contain NUL characters")
+            continue
+
+        if sample.timestamp is None:
+            sample.timestamp = received_at
+        elif sample.timestamp.tzinfo is None:
+            sample.timestamp = sample.timestamp.replace(tzinfo=timezone.utc)
+
+        if sample.timestamp < oldest:
+            position_watermarks.too_late_samples += 1
+            results[index] = reject_sample(
+                index, f"Sample is older than the {settings.telemetry_max_lateness_seconds}s lateness bound"
+            )
+        elif sample.timestamp > newest:
+            position_watermarks.future_samples += 1
+            results[index] = reject_sample(index, "Sample timestamp is ahead of server time")
+        else:
+            samples.append((index, sample))
+    return samples, results
+
+
+async def upsert_current_positions(
+    db: AsyncSession,
+    positions: List[Tuple[TelemetryDataCreate, int]]
+) -> List[int]:
+    """
+    Upsert current positions for (sample, hex_cell_id) pairs, at most one per drone,
+    then adjust hex occupancy counts for the drones that moved. Returns the drone ids
+    written; drones whose stored position is newer than the sample are left out.
+    """
+    if not positions:
+        return []
+
+    positions = sorted(positions, key=lambda position: position[0].drone_id)
+    result = await db.execute(UPSERT_CURRENT_POSITIONS, {
+        "drone_ids": [sample.drone_id for sample, _ in positions],
+        "flight_request_ids": [sample.flight_request_id for sample, _ in positions],
+        "hex_cell_ids": [cell_id for _, cell_id in positions],
+        "latitudes": [sample.latitude for sample, _ in positions],
+        "longitudes": [sample.longitude for sample, _ in positions],
+        "altitudes": [sample.altitude for sample, _ in positions],
+        "speeds": [sample.speed for sample, _ in positions],
+        "headings": [sample.heading for sample, _ in positions],
+        "battery_levels": [sample.battery_level for sample, _ in positions],
+        "statuses": [sample.status for sample, _ in positions],
+        "timestamps": [sample.timestamp for sample, _ in positions]
+    })
+    written = result.all()
+    await apply_hex_count_deltas(
+        db, hex_count_deltas((previous_cell_id, cell_id) for _, cell_id, previous_cell_id in written)
+    )
+    return [drone_id for drone_id, _, _ in written]
+
+
+class CommittedBatch(NamedTuple):
+    """What a committed ingest batch still has to hand to in-memory state and listeners"""
+    accepted: List[TelemetryDataCreate]
+    decisions: List[bool]
+    # Newest sample per drone offered to the current position upsert
+    positions: List[TelemetryDataCreate]
+    position_updates: List[PositionUpdate]
+    stored: List[TelemetryDataCreate]
+
+
+async def process_telemetry_batch_data(
+    valid_samples: List[TelemetryDataCreate],
+    db: AsyncSession,
+    received_at: Optional[List[float]] = None
+) -> Tuple[TelemetryBatchResult, CommittedBatch]:
+    """
+    Persist a batch of samples that passed validate_telemetry_samples in one
+    transaction; they aren't validated again, so the lateness bound stays the one
+    checked when they were received.
+
+    Every sample gets its own accept/reject entry so gateways can retry only the
+    failures. Telemetry rows, current position writes and hex count changes are
+    issued as multi-row statements instead of per-sample round trips. History rows
+    are only written for samples outside the telemetry dead band. The batch is
+    committed on return; pass the CommittedBatch to finish_committed_batch() once
+    the results are handed out. received_at holds per-sample time.monotonic()
+    receive times, defaulting to now.
+    """
+    if received_at is None:
+        received_at = [time.monotonic()] * len(valid_samples)
+    samples = list(enumerate(valid_samples))
+    results: List[Optional[TelemetryBatchItemResult]] = [None] * len(valid_samples)
+
+    # Unknown drones or flight requests would violate a foreign key and abort the
+    # whole transaction, so filter them out up front
+    drone_ids = {sample.drone_id for _, sample in samples}
+    flight_ids = {sample.flight_request_id for _, sample in samples if sample.flight_request_id is not None}
+
+    known_drones = set()
+    if drone_ids:
+        known_drones = set((await db.execute(select(Drone.id).where(Drone.id.in_(drone_ids)))).scalars().all())
+    known_flights = set()
+    if flight_ids:
+        known_flights = set((await db.execute(
+            select(FlightRequest.id).where(FlightRequest.id.in_(flight_ids))
+        )).scalars().all())
+
+    accepted: List[Tuple[int, TelemetryDataCreate]] = []
+    for index, sample in samples:
+        if sample.drone_id not in known_drones:
+            results[index] = reject_sample(index, f"Unknown drone {sample.drone_id}")
+        elif sample.flight_request_id is not None and sample.flight_request_id not in known_flights:
+            results[index] = reject_sample(index, f"Unknown flight request {sample.flight_request_id}")
+        else:
+            accepted.append((index, sample))
+
+    decisions: List[bool] = []
+    stored: List[Tuple[int, TelemetryDataCreate]] = []
+    latest: Dict[int, Tuple[int, TelemetryDataCreate, int]] = {}
+    position_updates: Dict[int, TelemetryDataCreate] = {}
+    if accepted:
+        # Samples inside the dead band only move the current position
+        decisions = telemetry_deadband.select([sample for _, sample in accepted])
+        stored = [entry for entry, store in zip(accepted, decisions) if store]
+
+        telemetry_ids: Dict[int, int] = {}
+        if stored and not telemetry_buffer.enabled:
+            # Telemetry history, one multi-row INSERT with ids returned in input order.
+            # With write-behind the rows are written after commit and ids aren't known yet.
+            inserted = await db.execute(
+                insert(TelemetryData).returning(TelemetryData.id, sort_by_parameter_order=True),
+                [sample.model_dump() for _, sample in stored]
+            )
+            telemetry_ids = dict(zip((index for index, _ in stored), inserted.scalars().all()))
+
+        # Only the newest sample per drone decides its current position, and only if
+        # it is ahead of what was already applied
+        for index, sample in accepted:
+            if position_watermarks.is_late(sample):
+                position_watermarks.late_samples += 1
+                continue
+            if sample.drone_id in latest and latest[sample.drone_id][1].timestamp > sample.timestamp:
+                continue
+            h3_index = h3.geo_to_h3(sample.latitude, sample.longitude, HEX_RESOLUTION)
+            hex_cell = hex_index.lookup(h3_index)
+            if hex_cell is None:
+                logger.warning(f"No hex cell found for H3 index {h3_index}. Position may be outside Kazakhstan.")
+                continue
+            latest[sample.drone_id] = (index, sample, hex_cell.id)
+
+        written = set(await upsert_current_positions(db, [(sample, cell_id) for _, sample, cell_id in latest.values()]))
+        position_updates = {index: sample for drone_id, (index, sample, _) in latest.items() if drone_id in written}
+
+        for (index, _), store in zip(accepted, decisions):
+            results[index] = TelemetryBatchItemResult(
+                index=index,
+                accepted=True,
+                telemetry_id=telemetry_ids.get(index),
+                position_updated=index in position_updates,
+                stored=store
+            )
+
+    await db.commit()
+
+    accepted_count = len(accepted)
+    result = TelemetryBatchResult(
+        accepted=accepted_count,
+        rejected=len(valid_samples) - accepted_count,
+        results=results
+    )
+    committed = CommittedBatch(
+        accepted=[sample for _, sample in accepted],
+        decisions=decisions,
+        positions=[sample for _, sample, _ in latest.values()],
+        position_updates=[PositionUpdate(sample, received_at[index]) for index, sample in position_updates.items()],
+        stored=[sample for _, sample in stored]
+    )
+    return result, committed
+
+
+async def finish_committed_batch(db: AsyncSession, batch: CommittedBatch):
+    """
+    Hand a committed batch to the dead band, watermarks, write-behind buffer,
+    position bus, other workers and zone monitor. The samples are already stored,
+    so each step is guarded on its own: a failure is logged and neither fails the
+    samples nor skips the other steps.
+    """
+    def enqueue_history():
+        if batch.stored and telemetry_buffer.enabled:
+            telemetry_buffer.enqueue(batch.stored)
+
+    steps = (
+        ("dead band", lambda: telemetry_deadband.commit(batch.accepted, batch.decisions)),
+        ("position watermarks", lambda: position_watermarks.advance(batch.positions)),
+        ("write-behind buffer", enqueue_history),
+        ("position bus", lambda: position_bus.publish(batch.position_updates)),
+        ("airspace events", lambda: airspace_events.publish_positions(
+            update.sample for update in batch.position_updates
+        ))
+    )
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"Error updating {name} after telemetry commit: {str(e)}", exc_info=True)
+
+    if batch.accepted:
+        # Zone checks once per accepted sample, alerts go out to the WebSocket viewers
+        try:
+            await zone_monitor.check_samples(db, batch.accepted)
+        except Exception as e:
+            logger.error(f"Error checking restricted zones after telemetry commit: {str(e)}", exc_info=True)
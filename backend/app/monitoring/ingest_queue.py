@@ -0,0 +1,221 @@
+# app/monitoring/ingest_queue.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from .ingest import finish_committed_batch, process_telemetry_batch_data, validate_telemetry_samples, reject_sample
+from .schemas import TelemetryDataCreate, TelemetryBatchItemResult, TelemetryBatchResult
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.ingest_queue")
+
+
+class IngestOverloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Telemetry ingest queue is full")
+        self.retry_after = retry_after
+
+
+class _PendingSample:
+    __slots__ = ("sample", "future", "received_at")
+
+    def __init__(self, sample: TelemetryDataCreate):
+        self.sample = sample
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.received_at = time.monotonic()
+
+
+class IngestQueue:
+    """
+    Bounded queue in front of the telemetry ingest pipeline.
+
+    A fixed pool of workers drains the queue in batches, so a slow database
+    holds back queued samples instead of piling up sessions on the event loop.
+    Past soft_limit a new sample replaces the pending one for the same drone:
+    current position stays fresh while history is thinned. Past hard_limit,
+    samples from drones with nothing pending are refused with IngestOverloaded.
+    """
+
+    def __init__(self, soft_limit: int, hard_limit: int, workers: int, batch_size: int, retry_after: int):
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retry_after = retry_after
+        self._pending: Deque[_PendingSample] = deque()
+        self._pending_by_drone: Dict[int, _PendingSample] = {}
+        self._not_empty = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.is_running = False
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.bisected = 0
+        self.poisoned = 0
+
+    def start(self):
+        """Start the worker pool"""
+        logger.info(f"Starting telemetry ingest queue with {self.workers} workers")
+        self.is_running = True
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop accepting work and let the workers drain what is queued"""
+        logger.info(f"Stopping telemetry ingest queue, draining {len(self._pending)} samples")
+        self.is_running = False
+        self._not_empty.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, sample: TelemetryDataCreate) -> asyncio.Future:
+        """Queue one validated sample, returning a future for its TelemetryBatchItemResult"""
+        depth = len(self._pending)
+        queued = self._pending_by_drone.get(sample.drone_id)
+
+        if depth >= self.soft_limit and queued is not None:
+            # Keep only the newest pending sample per drone, by device time
+            if sample.timestamp < queued.sample.timestamp:
+                self.coalesced += 1
+                dropped = asyncio.get_running_loop().create_future()
+                dropped.set_result(TelemetryBatchItemResult(index=0, accepted=True, coalesced=True))
+                return dropped
+            superseded = queued.future
+            queued.sample = sample
+            queued.future = asyncio.get_running_loop().create_future()
+            queued.received_at = time.monotonic()
+            if not superseded.done():
+                superseded.set_result(TelemetryBatchItemResult(index=0, accepted=True, coalesced=True))
+            self.coalesced += 1
+            return queued.future
+
+        if depth >= self.hard_limit or not self.is_running:
+            self.rejected += 1
+            raise IngestOverloaded(self.retry_after)
+
+        pending = _PendingSample(sample)
+        self._pending.append(pending)
+        self._pending_by_drone[sample.drone_id] = pending
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, depth + 1)
+        self._not_empty.set()
+        return pending.future
+
+    async def ingest(self, raw_samples: List[Any]) -> TelemetryBatchResult:
+        """
+        Validate, queue and await a batch of samples. Samples refused for overload
+        are rejected individually; if none could be queued, IngestOverloaded is raised.
+        """
+        samples, results = validate_telemetry_samples(raw_samples)
+
+        waiting = []
+        for index, sample in samples:
+            try:
+                waiting.append((index, self.submit(sample)))
+            except IngestOverloaded:
+                results[index] = reject_sample(index, "Ingest queue is full, retry later", retryable=True)
+
+        if samples and not waiting:
+            raise IngestOverloaded(self.retry_after)
+
+        for index, future in waiting:
+            try:
+                item = await future
+            except Exception:
+                results[index] = reject_sample(index, "Error processing telemetry", retryable=True)
+            else:
+                results[index] = item.model_copy(update={"index": index})
+
+        accepted = sum(1 for item in results if item.accepted)
+        return TelemetryBatchResult(accepted=accepted, rejected=len(results) - accepted, results=results)
+
+    async def _worker(self):
+        while self.is_running or self._pending:
+            if not self._pending:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                pending = self._pending.popleft()
+                if self._pending_by_drone.get(pending.sample.drone_id) is pending:
+                    del self._pending_by_drone[pending.sample.drone_id]
+                batch.append(pending)
+
+            await self._process(batch)
+
+    async def _process(self, batch: List[_PendingSample]):
+        """
+        Run a batch in one transaction and resolve its futures as soon as it
+        commits; post-commit work runs after that, outside the retries below.
+        A statement error that isn't a lost connection may come from a single
+        bad sample, so the batch is split in halves and each retried; a sample
+        that fails on its own is rejected as not retryable, the rest of the
+        batch goes through. Any other error fails the whole batch as retryable.
+        """
+        async with AsyncSessionLocal() as db:
+            try:
+                result, committed = await process_telemetry_batch_data(
+                    [pending.sample for pending in batch], db, [pending.received_at for pending in batch]
+                )
+                error = None
+            except Exception as e:
+                await db.rollback()
+                error = e
+
+            if error is None:
+                # Callers only wait for the commit; what follows can't fail their samples
+                for pending, item in zip(batch, result.results):
+                    if not pending.future.done():
+                        pending.future.set_result(item)
+                await finish_committed_batch(db, committed)
+                return
+
+        if not isinstance(error, DBAPIError) or error.connection_invalidated or isinstance(error, OperationalError):
+            logger.error(f"Error processing queued telemetry batch of {len(batch)}: {str(error)}", exc_info=error)
+            for pending in batch:
+                # Callers that went away (e.g. client disconnect) leave a cancelled future
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+            return
+
+        if len(batch) == 1:
+            pending = batch[0]
+            self.poisoned += 1
+            logger.warning(f"Database rejected telemetry sample of drone {pending.sample.drone_id}: {str(error)}")
+            if not pending.future.done():
+                pending.future.set_result(reject_sample(0, "Sample rejected by the database"))
+            return
+
+        self.bisected += 1
+        middle = len(batch) // 2
+        await self._process(batch[:middle])
+        await self._process(batch[middle:])
+
+    def get_stats(self):
+        return {
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "soft_limit": self.soft_limit,
+            "hard_limit": self.hard_limit,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "bisected": self.bisected,
+            "poisoned": self.poisoned
+        }
+
+
+ingest_queue = IngestQueue(
+    soft_limit=settings.ingest_queue_soft_limit,
+    hard_limit=settings.ingest_queue_hard_limit,
+    workers=settings.ingest_queue_workers,
+    batch_size=settings.ingest_queue_batch_size,
+    retry_after=settings.ingest_retry_after_seconds
+)
@@ -0,0 +1,157 @@
+# app/monitoring/janitor.py
+import asyncio
+import random
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+
+from ..config import settings
+from ..database import engine, AsyncSessionLocal
+from ..utils.logger import setup_logger
+from .occupancy import evict_stale_positions, hex_reconciler
+from .partitions import telemetry_partitions
+from .rollups import telemetry_rollups, telemetry_rollup_retention
+
+logger = setup_logger("utm.janitor")
+
+
+class MaintenanceJob:
+    """One periodic housekeeping task and its run metrics"""
+
+    def __init__(self, name: str, interval_seconds: float, run: Callable[[], Awaitable[Any]]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.run = run
+        # Session-level advisory lock key, the same in every worker
+        self.lock_key = zlib.crc32(f"utm.janitor.{name}".encode())
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped_locked = 0
+        self.last_run: Optional[datetime] = None
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+        self.durations_ms = deque(maxlen=100)
+
+    def get_stats(self):
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_locked": self.skipped_locked,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "avg_duration_ms": sum(self.durations_ms) / len(self.durations_ms) if self.durations_ms else 0,
+            "max_duration_ms": max(self.durations_ms) if self.durations_ms else 0
+        }
+
+
+class Janitor:
+    """
+    Scheduler for the periodic housekeeping jobs of the monitoring subsystem.
+
+    Every job runs on its own interval, stretched or shortened by up to
+    jitter_fraction so workers started together don't hit the database in
+    lockstep. A job only runs while holding its Postgres advisory lock; the
+    other workers skip that run, so each job runs once per interval across
+    the whole deployment rather than once per worker.
+    """
+
+    def __init__(self, jitter_fraction: float):
+        self.jitter_fraction = jitter_fraction
+        self.jobs: Dict[str, MaintenanceJob] = {}
+        self.is_running = False
+        self._stopped = asyncio.Event()
+
+    def add(self, name: str, interval_seconds: float, run: Callable[[], Awaitable[Any]]):
+        self.jobs[name] = MaintenanceJob(name, interval_seconds, run)
+
+    async def start(self):
+        """Run every job on its own schedule until stopped"""
+        logger.info(f"Starting janitor: {', '.join(f'{job.name} every {job.interval_seconds}s' for job in self.jobs.values())}")
+        self.is_running = True
+        self._stopped.clear()
+        await asyncio.gather(*(self._schedule(job) for job in self.jobs.values()))
+
+    def stop(self):
+        """Stop scheduling; a job that is running finishes first"""
+        self.is_running = False
+        self._stopped.set()
+
+    async def _schedule(self, job: MaintenanceJob):
+        # Spread first runs over one interval, then keep interval +- jitter
+        delay = random.uniform(0, job.interval_seconds)
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.run_job(job.name)
+            except Exception:
+                pass
+            delay = job.interval_seconds * random.uniform(1 - self.jitter_fraction, 1 + self.jitter_fraction)
+
+    async def run_job(self, name: str, wait: bool = False):
+        """
+        Run a job now under its advisory lock. With wait, block until the lock is
+        free (used at startup); otherwise skip the run if another worker holds it.
+        Errors are recorded and re-raised.
+        """
+        job = self.jobs[name]
+        async with engine.connect() as conn:
+            if wait:
+                await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": job.lock_key})
+            else:
+                locked = await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": job.lock_key})
+                if not locked.scalar():
+                    job.skipped_locked += 1
+                    return
+
+            start = time.perf_counter()
+            try:
+                job.last_result = await job.run()
+                job.last_error = None
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                logger.error(f"Janitor job {name} failed: {str(e)}", exc_info=True)
+                raise
+            finally:
+                job.runs += 1
+                job.last_run = datetime.utcnow()
+                job.durations_ms.append((time.perf_counter() - start) * 1000)
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": job.lock_key})
+
+    def get_stats(self):
+        return {name: job.get_stats() for name, job in self.jobs.items()}
+
+
+async def evict_stale_drone_positions() -> int:
+    """Remove positions of grounded drones not updated within stale_position_max_age_seconds"""
+    async with AsyncSessionLocal() as db:
+        evicted = await evict_stale_positions(
+            db,
+            datetime.utcnow() - timedelta(seconds=settings.stale_position_max_age_seconds)
+        )
+        await db.commit()
+    if evicted:
+        logger.info(f"Evicted {evicted} stale drone positions")
+    return evicted
+
+
+async def reconcile_hex_occupancy() -> int:
+    return len(await hex_reconciler.run_once())
+
+
+janitor = Janitor(settings.janitor_jitter_fraction)
+janitor.add("stale_positions", settings.stale_position_eviction_interval_seconds, evict_stale_drone_positions)
+janitor.add("hex_reconciliation", settings.hex_count_reconcile_interval_seconds, reconcile_hex_occupancy)
+janitor.add("telemetry_partitions", settings.telemetry_partition_maintenance_interval_seconds, telemetry_partitions.run_once)
+janitor.add("telemetry_rollups", settings.telemetry_rollup_interval_seconds, telemetry_rollups.run_once)
+janitor.add("telemetry_rollup_retention", settings.telemetry_rollup_retention_interval_seconds, telemetry_rollup_retention.run_once)
@@ -1,5 +1,5 @@
 # app/monitoring/models.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, ARRAY
+from sqlalchemy import text, Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, ARRAY, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
@@ -38,6 +38,8 @@ class CurrentDronePosition(Base):
     drone_id = Column(Integer, ForeignKey("drones.id"), nullable=False)
     flight_request_id = Column(Integer, ForeignKey("flight_requests.id"))
     hex_cell_id = Column(Integer, ForeignKey("hex_grid_cells.id"), nullable=False, index=True)
+    # Cell the drone was in before the last upsert, returned to drive hex count changes
+    previous_hex_cell_id = Column(Integer)
     
     # Position data
     latitude = Column(Float, nullable=False)
@@ -63,13 +65,15 @@ class CurrentDronePosition(Base):
     __table_args__ = (
         # Add composite index for common query patterns
         Index('idx_current_pos_hex_cell_status', 'hex_cell_id', 'status'),
+        # One current position per drone, target of the ingest upsert
+        UniqueConstraint('drone_id', name='uq_current_drone_positions_drone_id'),
     )
 
 
 class TelemetryData(Base):
     __tablename__ = "telemetry_data"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     drone_id = Column(Integer, ForeignKey("drones.id"), nullable=False)
     flight_request_id = Column(Integer, ForeignKey("flight_requests.id"))
 
@@ -86,13 +90,64 @@ class TelemetryData(Base):
     # Status
     status = Column(String, default="airborne")  # airborne, landed, emergency
 
-    # Timestamp
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamp. The table is range partitioned by it (see partitions.py), so it has
+    # to be part of the primary key
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     # Relationships
     drone = relationship("Drone", back_populates="telemetry")
     flight_request = relationship("FlightRequest")
 
+    __table_args__ = (
+        # Newest-first keyset paging per drone (history.py)
+        Index('ix_telemetry_data_drone_id_timestamp_id', 'drone_id', text('timestamp DESC'), text('id DESC')),
+        # Append-only in time order, so a BRIN index keeps time-range scans (rollups) cheap
+        Index('ix_telemetry_data_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+
+
+class TelemetryRollup(Base):
+    """Per-drone telemetry aggregated into fixed time buckets (see rollups.py)"""
+    __tablename__ = "telemetry_rollups"
+
+    drone_id = Column(Integer, ForeignKey("drones.id"), primary_key=True)
+    resolution_seconds = Column(Integer, primary_key=True)  # bucket width: 10, 60
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    sample_count = Column(Integer, nullable=False)
+
+    # Position
+    mean_latitude = Column(Float, nullable=False)
+    mean_longitude = Column(Float, nullable=False)
+    last_latitude = Column(Float, nullable=False)
+    last_longitude = Column(Float, nullable=False)
+    min_altitude = Column(Float, nullable=False)
+    max_altitude = Column(Float, nullable=False)
+
+    # Flight data
+    mean_speed = Column(Float)  # m/s
+    min_battery_level = Column(Float)  # percentage
+    last_status = Column(String)
+
+    __table_args__ = (
+        # Retention deletes by resolution and age
+        Index('ix_telemetry_rollups_resolution_bucket', 'resolution_seconds', 'bucket_start'),
+    )
+
+
+class TelemetryRollupWatermark(Base):
+    """End of the last bucket rolled up at each resolution"""
+    __tablename__ = "telemetry_rollup_watermarks"
+
+    resolution_seconds = Column(Integer, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+OPEN_ZONE_ENTRY_CONDITION = text(
+    "alert_type = 'restricted_zone_violation' AND exited_at IS NULL AND zone_id IS NOT NULL"
+)
+
 
 class Alert(Base):
     __tablename__ = "alerts"
@@ -111,6 +166,10 @@ class Alert(Base):
     longitude = Column(Float)
     altitude = Column(Float)
 
+    # Restricted zone alerts: the zone entered and when the drone left it again
+    zone_id = Column(Integer, ForeignKey("restricted_zones.id", ondelete="SET NULL"))
+    exited_at = Column(DateTime(timezone=True))
+
     # Status
     is_resolved = Column(Boolean, default=False)
     resolved_at = Column(DateTime(timezone=True))
@@ -122,4 +181,15 @@ class Alert(Base):
     # Relationships
     drone = relationship("Drone")
     flight_request = relationship("FlightRequest")
-    resolver = relationship("User", foreign_keys=[resolved_by])
\ No newline at end of file
+    resolver = relationship("User", foreign_keys=[resolved_by])
+
+    __table_args__ = (
+        # One open entry per drone and zone: the drone is inside the zone until exited_at
+        # is set. Workers racing on the same transition insert or close it only once.
+        Index(
+            'uq_alerts_open_zone_entry',
+            'drone_id', 'zone_id',
+            unique=True,
+            postgresql_where=OPEN_ZONE_ENTRY_CONDITION
+        ),
+    )
\ No newline at end of file
@@ -0,0 +1,225 @@
+# app/monitoring/notify.py
+import asyncio
+import json
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, List
+
+from ..config import settings
+from ..database import engine
+from ..utils.logger import setup_logger
+from .position_bus import position_bus, PositionUpdate
+from .schemas import TelemetryDataCreate
+
+logger = setup_logger("utm.notify")
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD_BYTES = 7800
+
+# Positions travel as compact lists in this field order
+POSITION_FIELDS = (
+    "drone_id", "flight_request_id", "latitude", "longitude", "altitude",
+    "speed", "heading", "battery_level", "status", "timestamp"
+)
+
+
+def encode_position(sample: TelemetryDataCreate) -> list:
+    return [
+        sample.drone_id, sample.flight_request_id, sample.latitude, sample.longitude, sample.altitude,
+        sample.speed, sample.heading, sample.battery_level, sample.status, sample.timestamp.isoformat()
+    ]
+
+
+def decode_position(item: list) -> TelemetryDataCreate:
+    return TelemetryDataCreate(**dict(zip(POSITION_FIELDS, item)))
+
+
+class AirspaceEventChannel:
+    """
+    Cross-worker airspace events over Postgres LISTEN/NOTIFY.
+
+    Each uvicorn worker has its own WebSocket viewers, so accepted positions and
+    broadcast messages are also published here and replayed by the other
+    workers. Events are buffered and sent every flush_interval_ms as a few
+    NOTIFYs, each packing as many events of one kind as fit in a payload.
+    Positions are coalesced to the newest per drone between flushes, so NOTIFY
+    volume is bounded by fleet size, not telemetry rate. Workers skip their own
+    notifications by origin id. Events are best effort: a batch that fails to
+    send is dropped rather than queued up.
+    """
+
+    def __init__(self, channel: str, flush_interval_ms: int, enabled: bool):
+        self.channel = channel
+        self.flush_interval = flush_interval_ms / 1000
+        self.enabled = enabled
+        self.origin = uuid.uuid4().hex
+        self.is_running = False
+        # Dedicated connection holding the LISTEN, also used to send NOTIFYs
+        self.connection = None
+        self.driver_connection = None
+        self.handlers: Dict[str, List[Callable[[list], None]]] = defaultdict(list)
+        self.pending_positions: Dict[int, list] = {}
+        self.pending_messages: List[dict] = []
+        self.pending_events: Dict[str, list] = defaultdict(list)
+
+        self.notifies_sent = 0
+        self.events_sent = 0
+        self.notifies_received = 0
+        self.events_received = 0
+        self.events_oversized = 0
+        self.errors = 0
+        self.flush_times = deque(maxlen=1000)
+
+    def subscribe(self, kind: str, handler: Callable[[list], None]):
+        """Call handler with the items of every batch of kind published by another worker"""
+        self.handlers[kind].append(handler)
+
+    def publish_positions(self, samples: Iterable[TelemetryDataCreate]):
+        if not self.enabled:
+            return
+        for sample in samples:
+            self.pending_positions[sample.drone_id] = encode_position(sample)
+
+    def publish_message(self, message: dict):
+        """WebSocket message every worker should broadcast to its viewers"""
+        if self.enabled:
+            self.pending_messages.append(message)
+
+    def publish_event(self, kind: str, item=None):
+        """Event of another kind for the other workers' subscribers of that kind"""
+        if self.enabled:
+            self.pending_events[kind].append(item)
+
+    async def start(self):
+        """Listen for other workers' events and flush ours periodically"""
+        if not self.enabled:
+            return
+        logger.info(f"Starting airspace event channel '{self.channel}' (worker {self.origin[:8]})")
+        self.is_running = True
+        while self.is_running:
+            try:
+                await self.listen()
+                await self.flush()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Airspace event channel error: {str(e)}", exc_info=True)
+                await self.close()
+            await asyncio.sleep(self.flush_interval)
+        await self.close()
+
+    def stop(self):
+        """Stop the event channel"""
+        self.is_running = False
+
+    async def listen(self):
+        if self.driver_connection is not None and not self.driver_connection.is_closed():
+            return
+        await self.close()
+        self.connection = await engine.connect()
+        raw_connection = await self.connection.get_raw_connection()
+        self.driver_connection = raw_connection.driver_connection
+        await self.driver_connection.add_listener(self.channel, self._on_notify)
+        logger.info(f"Listening on '{self.channel}'")
+
+    async def close(self):
+        if self.connection is None:
+            return
+        try:
+            # A connection that held a LISTEN shouldn't go back to the pool
+            await self.connection.invalidate()
+            await self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+        self.driver_connection = None
+
+    def _encode_batches(self, kind: str, items: List) -> List[str]:
+        """Pack items into as few payloads as fit under the NOTIFY size limit"""
+        prefix = f'{{"origin":"{self.origin}","kind":"{kind}","items":['
+        payloads = []
+        batch: List[str] = []
+        size = len(prefix) + 2
+        for item in items:
+            encoded = json.dumps(item, separators=(",", ":"), default=str)
+            if len(prefix) + len(encoded.encode()) + 2 > MAX_NOTIFY_PAYLOAD_BYTES:
+                self.events_oversized += 1
+                continue
+            if batch and size + len(encoded.encode()) + 1 > MAX_NOTIFY_PAYLOAD_BYTES:
+                payloads.append(prefix + ",".join(batch) + "]}")
+                batch = []
+                size = len(prefix) + 2
+            batch.append(encoded)
+            size += len(encoded.encode()) + 1
+        if batch:
+            payloads.append(prefix + ",".join(batch) + "]}")
+        return payloads
+
+    async def flush(self):
+        positions = list(self.pending_positions.values())
+        messages = self.pending_messages
+        events = self.pending_events
+        self.pending_positions = {}
+        self.pending_messages = []
+        self.pending_events = defaultdict(list)
+
+        payloads = self._encode_batches("positions", positions) + self._encode_batches("messages", messages)
+        for kind, items in events.items():
+            payloads += self._encode_batches(kind, items)
+        if not payloads:
+            return
+        start = time.perf_counter()
+        await self.driver_connection.executemany(
+            "SELECT pg_notify($1, $2)",
+            [(self.channel, payload) for payload in payloads]
+        )
+        self.notifies_sent += len(payloads)
+        self.events_sent += len(positions) + len(messages) + sum(len(items) for items in events.values())
+        self.flush_times.append((time.perf_counter() - start) * 1000)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed notification on '{channel}'")
+            return
+        if event.get("origin") == self.origin:
+            return
+
+        items = event.get("items", [])
+        self.notifies_received += 1
+        self.events_received += len(items)
+        for handler in self.handlers.get(event.get("kind"), ()):
+            try:
+                handler(items)
+            except Exception as e:
+                logger.error(f"Error handling {event.get('kind')} notification: {str(e)}", exc_info=True)
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "listening": self.driver_connection is not None and not self.driver_connection.is_closed(),
+            "notifies_sent": self.notifies_sent,
+            "events_sent": self.events_sent,
+            "notifies_received": self.notifies_received,
+            "events_received": self.events_received,
+            "events_oversized": self.events_oversized,
+            "errors": self.errors,
+            "avg_flush_ms": sum(self.flush_times) / len(self.flush_times) if self.flush_times else 0
+        }
+
+
+def replay_remote_positions(items: list):
+    """Positions accepted by another worker go to this worker's airspace broadcaster"""
+    received_at = time.monotonic()
+    position_bus.publish(
+        PositionUpdate(decode_position(item), received_at) for item in items
+    )
+
+
+airspace_events = AirspaceEventChannel(
+    settings.airspace_notify_channel,
+    settings.airspace_notify_interval_ms,
+    settings.airspace_notify_enabled
+)
+airspace_events.subscribe("positions", replay_remote_positions)
@@ -0,0 +1,144 @@
+# app/monitoring/occupancy.py
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.occupancy")
+
+# Rows of hex_grid_cells are only ever locked through LOCK_HEX_CELLS, in id
+# order, and current_drone_positions rows in drone_id order, positions before
+# cells. Concurrent ingest batches, eviction and reconciliation touching the same
+# rows therefore queue behind each other instead of deadlocking.
+LOCK_HEX_CELLS = text("""
+    SELECT id FROM hex_grid_cells
+    WHERE id = ANY(CAST(:cell_ids AS integer[]))
+    ORDER BY id
+    FOR UPDATE
+""")
+
+# Atomic increments/decrements of the cells locked above; no count is ever read
+# into Python and written back
+APPLY_HEX_COUNT_DELTAS = text("""
+    UPDATE hex_grid_cells
+    SET drones_count = GREATEST(COALESCE(hex_grid_cells.drones_count, 0) + deltas.delta, 0),
+        last_updated = now()
+    FROM unnest(CAST(:cell_ids AS integer[]), CAST(:deltas AS integer[])) AS deltas(cell_id, delta)
+    WHERE hex_grid_cells.id = deltas.cell_id
+""")
+
+# Stale grounded positions, locked in drone_id order. The row lock re-checks the
+# condition, so a drone that reported in the meantime is left alone.
+LOCK_STALE_POSITIONS = text("""
+    SELECT drone_id FROM current_drone_positions
+    WHERE last_update < :stale_before
+    AND status IN ('landed', 'emergency', 'disconnected')
+    ORDER BY drone_id
+    FOR UPDATE
+""")
+
+DELETE_POSITIONS = text("""
+    DELETE FROM current_drone_positions
+    WHERE drone_id = ANY(CAST(:drone_ids AS integer[]))
+    RETURNING hex_cell_id
+""")
+
+# Cells whose recorded occupancy differs from a GROUP BY over
+# current_drone_positions. The correction is applied as a delta on top of the
+# current value, so increments committed by concurrent ingest meanwhile are preserved.
+FIND_HEX_COUNT_DRIFT = text("""
+    SELECT h.id, COALESCE(h.drones_count, 0) AS recorded, COUNT(cp.id) AS actual
+    FROM hex_grid_cells h
+    LEFT JOIN current_drone_positions cp ON cp.hex_cell_id = h.id
+    GROUP BY h.id
+    HAVING COALESCE(h.drones_count, 0) <> COUNT(cp.id)
+""")
+
+
+def hex_count_deltas(moves: Iterable[Tuple[Optional[int], Optional[int]]]) -> Dict[int, int]:
+    """Occupancy change per cell for (previous_cell_id, cell_id) moves, None meaning no cell"""
+    deltas: Dict[int, int] = defaultdict(int)
+    for previous_cell_id, cell_id in moves:
+        if previous_cell_id == cell_id:
+            continue
+        if previous_cell_id is not None:
+            deltas[previous_cell_id] -= 1
+        if cell_id is not None:
+            deltas[cell_id] += 1
+    return deltas
+
+
+async def apply_hex_count_deltas(db: AsyncSession, deltas: Dict[int, int]):
+    """Lock the cells in id order, then apply the deltas in one statement"""
+    cell_ids = sorted(cell_id for cell_id, delta in deltas.items() if delta)
+    if not cell_ids:
+        return
+    await db.execute(LOCK_HEX_CELLS, {"cell_ids": cell_ids})
+    await db.execute(APPLY_HEX_COUNT_DELTAS, {
+        "cell_ids": cell_ids,
+        "deltas": [deltas[cell_id] for cell_id in cell_ids]
+    })
+
+
+async def evict_stale_positions(db: AsyncSession, stale_before: datetime) -> int:
+    """Remove positions of grounded/disconnected drones not updated since stale_before"""
+    drone_ids = (await db.execute(LOCK_STALE_POSITIONS, {"stale_before": stale_before})).scalars().all()
+    if not drone_ids:
+        return 0
+    result = await db.execute(DELETE_POSITIONS, {"drone_ids": list(drone_ids)})
+    evicted = result.scalars().all()
+    await apply_hex_count_deltas(db, hex_count_deltas((cell_id, None) for cell_id in evicted))
+    return len(evicted)
+
+
+async def reconcile_hex_counts(db: AsyncSession) -> List[dict]:
+    """Correct hex drone counts that drifted from current_drone_positions"""
+    drift = (await db.execute(FIND_HEX_COUNT_DRIFT)).all()
+    await apply_hex_count_deltas(db, {cell_id: actual - recorded for cell_id, recorded, actual in drift})
+    return [
+        {"hex_cell_id": cell_id, "recorded": recorded, "actual": actual}
+        for cell_id, recorded, actual in drift
+    ]
+
+
+class HexOccupancyReconciler:
+    """Recompute hex occupancy counts and report the drift corrected; scheduled by the janitor"""
+
+    def __init__(self):
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self.last_cells_corrected = 0
+        self.last_drift = 0
+        self.total_drift_corrected = 0
+
+    async def run_once(self) -> List[dict]:
+        async with AsyncSessionLocal() as db:
+            corrections = await reconcile_hex_counts(db)
+            await db.commit()
+
+        drift = sum(abs(c["actual"] - c["recorded"]) for c in corrections)
+        self.runs += 1
+        self.last_run = datetime.utcnow()
+        self.last_cells_corrected = len(corrections)
+        self.last_drift = drift
+        self.total_drift_corrected += drift
+
+        if corrections:
+            logger.warning(f"Corrected hex drone count drift of {drift} across {len(corrections)} cells")
+        return corrections
+
+    def get_stats(self):
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_cells_corrected": self.last_cells_corrected,
+            "last_drift": self.last_drift,
+            "total_drift_corrected": self.total_drift_corrected
+        }
+
+
+hex_reconciler = HexOccupancyReconciler()
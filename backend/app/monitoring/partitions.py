@@ -0,0 +1,141 @@
+# app/monitoring/partitions.py
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.partitions")
+
+TELEMETRY_TABLE = "telemetry_data"
+
+# Bounds are rendered in the session time zone, so pin it to UTC for parsing
+LIST_PARTITIONS = text("""
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table_name
+""")
+
+IS_PARTITIONED = text("""
+    SELECT EXISTS (SELECT 1 FROM pg_class WHERE relname = :table_name AND relkind = 'p')
+""")
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class TelemetryPartition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+
+def _parse_bound(value: str) -> datetime:
+    return datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{TELEMETRY_TABLE}_p{start:%Y%m%d}"
+
+
+def aligned_partition_start(moment: datetime, interval_days: int) -> datetime:
+    """Start of the partition containing moment; partitions are aligned to UTC days since the epoch"""
+    epoch_days = (moment.astimezone(timezone.utc).date() - datetime(1970, 1, 1).date()).days
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=epoch_days - epoch_days % interval_days)
+
+
+async def list_partitions(db: AsyncSession) -> List[TelemetryPartition]:
+    """Range partitions of telemetry_data ordered by start; the default partition, if any, is skipped"""
+    await db.execute(text("SET LOCAL TimeZone = 'UTC'"))
+    result = await db.execute(LIST_PARTITIONS, {"table_name": TELEMETRY_TABLE})
+    partitions = []
+    for name, bound in result.all():
+        match = _BOUND_PATTERN.search(bound or "")
+        if match:
+            partitions.append(TelemetryPartition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+async def create_future_partitions(db: AsyncSession, now: datetime) -> List[str]:
+    """
+    Create partitions up to partition_premake intervals past now. New partitions
+    continue from the last existing upper bound, so changing the interval never
+    produces overlapping ranges.
+    """
+    if not (await db.execute(IS_PARTITIONED, {"table_name": TELEMETRY_TABLE})).scalar_one():
+        logger.warning(f"{TELEMETRY_TABLE} is not partitioned yet, run the alembic migrations")
+        return []
+
+    interval = timedelta(days=settings.telemetry_partition_days)
+    horizon = now + interval * settings.telemetry_partition_premake
+
+    partitions = await list_partitions(db)
+    start = partitions[-1].end if partitions else aligned_partition_start(now, settings.telemetry_partition_days)
+
+    created = []
+    while start <= horizon:
+        end = start + interval
+        name = partition_name(start)
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TELEMETRY_TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created.append(name)
+        start = end
+    return created
+
+
+async def drop_expired_partitions(db: AsyncSession, now: datetime) -> List[str]:
+    """Drop whole partitions whose range ended before the retention window"""
+    cutoff = now - timedelta(days=settings.telemetry_retention_days)
+    dropped = []
+    for partition in await list_partitions(db):
+        if partition.end <= cutoff:
+            await db.execute(text(f"DROP TABLE IF EXISTS {partition.name}"))
+            dropped.append(partition.name)
+    return dropped
+
+
+class TelemetryPartitionManager:
+    """Keep future telemetry_data partitions created and drop those past retention; scheduled by the janitor"""
+
+    def __init__(self):
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self.partitions_created = 0
+        self.partitions_dropped = 0
+
+    async def run_once(self):
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            created = await create_future_partitions(db, now)
+            dropped = await drop_expired_partitions(db, now)
+            await db.commit()
+
+        self.runs += 1
+        self.last_run = datetime.utcnow()
+        self.partitions_created += len(created)
+        self.partitions_dropped += len(dropped)
+
+        if created:
+            logger.info(f"Created telemetry partitions: {', '.join(created)}")
+        if dropped:
+            logger.info(f"Dropped expired telemetry partitions: {', '.join(dropped)}")
+
+    def get_stats(self):
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "partitions_created": self.partitions_created,
+            "partitions_dropped": self.partitions_dropped,
+            "partition_days": settings.telemetry_partition_days,
+            "retention_days": settings.telemetry_retention_days
+        }
+
+
+telemetry_partitions = TelemetryPartitionManager()
@@ -0,0 +1,81 @@
+# app/monitoring/position_bus.py
+import asyncio
+from typing import Dict, Iterable, List, NamedTuple
+
+from .schemas import TelemetryDataCreate
+
+
+class PositionUpdate(NamedTuple):
+    sample: TelemetryDataCreate
+    received_at: float  # time.monotonic() when the server received the sample
+
+
+class PositionSubscription:
+    """Mailbox of a bus subscriber, holding only the newest pending update per drone"""
+
+    def __init__(self):
+        self._pending: Dict[int, PositionUpdate] = {}
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, update: PositionUpdate):
+        pending = self._pending.get(update.sample.drone_id)
+        if pending is not None:
+            self.coalesced += 1
+            # Relayed updates can arrive after a newer local one; keep the newer sample
+            if update.sample.timestamp < pending.sample.timestamp:
+                return
+        self._pending[update.sample.drone_id] = update
+        self._ready.set()
+
+    async def wait(self):
+        """Wait until at least one update is pending"""
+        await self._ready.wait()
+
+    def wake(self):
+        self._ready.set()
+
+    def drain(self) -> List[PositionUpdate]:
+        updates = list(self._pending.values())
+        self._pending = {}
+        self._ready.clear()
+        return updates
+
+
+class PositionBus:
+    """
+    In-process pub/sub for accepted current-position updates.
+
+    The ingest pipeline publishes right after commit, so subscribers see a
+    position without a round trip through current_drone_positions. Publishing
+    never blocks: a slow subscriber only ends up with fewer, newer updates.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[PositionSubscription] = []
+        self.published = 0
+
+    def subscribe(self) -> PositionSubscription:
+        subscription = PositionSubscription()
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PositionSubscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, updates: Iterable[PositionUpdate]):
+        for update in updates:
+            self.published += 1
+            for subscription in self._subscriptions:
+                subscription.offer(update)
+
+    def get_stats(self):
+        return {
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+            "coalesced": sum(subscription.coalesced for subscription in self._subscriptions)
+        }
+
+
+position_bus = PositionBus()
@@ -0,0 +1,282 @@
+# app/monitoring/rollups.py
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from .models import TelemetryRollupWatermark
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.rollups")
+
+# (resolution, source resolution) pairs, finest first. The finest level is built
+# from raw telemetry_data (source None), each coarser level from the one before it.
+ROLLUP_LEVELS = ((10, None), (60, 10))
+ROLLUP_RESOLUTIONS = tuple(resolution for resolution, _ in ROLLUP_LEVELS)
+
+_ROLLUP_COLUMNS = """
+    drone_id, resolution_seconds, bucket_start, sample_count,
+    mean_latitude, mean_longitude, last_latitude, last_longitude,
+    min_altitude, max_altitude, mean_speed, min_battery_level, last_status
+"""
+
+_ROLLUP_CONFLICT = """
+    ON CONFLICT (drone_id, resolution_seconds, bucket_start) DO UPDATE SET
+        sample_count = EXCLUDED.sample_count,
+        mean_latitude = EXCLUDED.mean_latitude,
+        mean_longitude = EXCLUDED.mean_longitude,
+        last_latitude = EXCLUDED.last_latitude,
+        last_longitude = EXCLUDED.last_longitude,
+        min_altitude = EXCLUDED.min_altitude,
+        max_altitude = EXCLUDED.max_altitude,
+        mean_speed = EXCLUDED.mean_speed,
+        min_battery_level = EXCLUDED.min_battery_level,
+        last_status = EXCLUDED.last_status
+"""
+
+# Aggregate raw rows in [start, end) into buckets. Re-running a window overwrites
+# its buckets, so a crash between insert and watermark update is harmless.
+ROLLUP_FROM_TELEMETRY = text(f"""
+    INSERT INTO telemetry_rollups ({_ROLLUP_COLUMNS})
+    SELECT
+        drone_id,
+        CAST(:resolution AS integer),
+        date_bin(CAST(:bucket AS interval), timestamp, TIMESTAMPTZ 'epoch') AS bucket,
+        COUNT(*),
+        AVG(latitude),
+        AVG(longitude),
+        (array_agg(latitude ORDER BY timestamp DESC))[1],
+        (array_agg(longitude ORDER BY timestamp DESC))[1],
+        MIN(altitude),
+        MAX(altitude),
+        AVG(speed),
+        MIN(battery_level),
+        (array_agg(status ORDER BY timestamp DESC))[1]
+    FROM telemetry_data
+    WHERE timestamp >= :start AND timestamp < :end
+    GROUP BY drone_id, bucket
+    {_ROLLUP_CONFLICT}
+""")
+
+# Merge finer buckets into coarser ones; means are weighted by sample count
+ROLLUP_FROM_ROLLUP = text(f"""
+    INSERT INTO telemetry_rollups ({_ROLLUP_COLUMNS})
+    SELECT
+        drone_id,
+        CAST(:resolution AS integer),
+        date_bin(CAST(:bucket AS interval), bucket_start, TIMESTAMPTZ 'epoch') AS bucket,
+        SUM(sample_count),
+        SUM(mean_latitude * sample_count) / SUM(sample_count),
+        SUM(mean_longitude * sample_count) / SUM(sample_count),
+        (array_agg(last_latitude ORDER BY bucket_start DESC))[1],
+        (array_agg(last_longitude ORDER BY bucket_start DESC))[1],
+        MIN(min_altitude),
+        MAX(max_altitude),
+        SUM(mean_speed * sample_count) / NULLIF(SUM(sample_count) FILTER (WHERE mean_speed IS NOT NULL), 0),
+        MIN(min_battery_level),
+        (array_agg(last_status ORDER BY bucket_start DESC))[1]
+    FROM telemetry_rollups
+    WHERE resolution_seconds = :source_resolution
+    AND bucket_start >= :start AND bucket_start < :end
+    GROUP BY drone_id, bucket
+    {_ROLLUP_CONFLICT}
+""")
+
+# Delete one batch of a resolution's buckets older than the cutoff. Batches keep
+# each statement's locks and WAL short next to the rollup job's inserts.
+EXPIRE_ROLLUPS = text("""
+    DELETE FROM telemetry_rollups
+    WHERE ctid = ANY(ARRAY(
+        SELECT ctid FROM telemetry_rollups
+        WHERE resolution_seconds = :resolution AND bucket_start < :cutoff
+        LIMIT :batch
+    ))
+""")
+
+
+def floor_to_resolution(moment: datetime, resolution: int) -> datetime:
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % resolution, tz=timezone.utc)
+
+
+async def _source_start(db: AsyncSession, source: Optional[int]) -> Optional[datetime]:
+    """Earliest timestamp available to roll up at a level that has no watermark yet"""
+    if source is None:
+        return (await db.execute(text("SELECT MIN(timestamp) FROM telemetry_data"))).scalar_one()
+    return (await db.execute(
+        text("SELECT MIN(bucket_start) FROM telemetry_rollups WHERE resolution_seconds = :source"),
+        {"source": source}
+    )).scalar_one()
+
+
+async def _set_watermark(db: AsyncSession, resolution: int, watermark: datetime):
+    statement = pg_insert(TelemetryRollupWatermark).values(resolution_seconds=resolution, watermark=watermark)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[TelemetryRollupWatermark.resolution_seconds],
+        set_={"watermark": statement.excluded.watermark, "updated_at": datetime.now(timezone.utc)}
+    ))
+
+
+class TelemetryRollupJob:
+    """
+    Job that rolls telemetry history up into coarser buckets, scheduled by the janitor.
+
+    Each resolution keeps a watermark at the end of the last bucket it closed,
+    so every run only reads rows newer than that. A bucket is closed once
+    lag_seconds have passed since its end; buckets are never revisited, so the
+    lag covers the ingest lateness bound and the write-behind flush interval.
+    """
+
+    def __init__(self, lag_seconds: int, chunk_seconds: int):
+        self.lag_seconds = lag_seconds
+        self.chunk_seconds = chunk_seconds
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self.buckets_written: Dict[int, int] = {resolution: 0 for resolution in ROLLUP_RESOLUTIONS}
+        self.watermarks: Dict[int, Optional[datetime]] = {resolution: None for resolution in ROLLUP_RESOLUTIONS}
+
+    async def run_once(self):
+        closed_before = datetime.now(timezone.utc) - timedelta(seconds=self.lag_seconds)
+        async with AsyncSessionLocal() as db:
+            stored = await db.execute(select(TelemetryRollupWatermark))
+            watermarks = {row.resolution_seconds: row.watermark for row in stored.scalars().all()}
+
+            for resolution, source in ROLLUP_LEVELS:
+                # A coarser level can't run ahead of the level it is built from
+                limit = closed_before if source is None else watermarks.get(source)
+                if limit is None:
+                    continue
+                end = floor_to_resolution(limit, resolution)
+
+                start = watermarks.get(resolution)
+                if start is None:
+                    first = await _source_start(db, source)
+                    if first is None:
+                        continue
+                    start = floor_to_resolution(first, resolution)
+
+                chunk = timedelta(seconds=max(resolution, self.chunk_seconds // resolution * resolution))
+                while start < end:
+                    chunk_end = min(start + chunk, end)
+                    if source is None:
+                        result = await db.execute(ROLLUP_FROM_TELEMETRY, {
+                            "resolution": resolution,
+                            "bucket": timedelta(seconds=resolution),
+                            "start": start,
+                            "end": chunk_end
+                        })
+                    else:
+                        result = await db.execute(ROLLUP_FROM_ROLLUP, {
+                            "resolution": resolution,
+                            "source_resolution": source,
+                            "bucket": timedelta(seconds=resolution),
+                            "start": start,
+                            "end": chunk_end
+                        })
+                    await _set_watermark(db, resolution, chunk_end)
+                    await db.commit()
+
+                    self.buckets_written[resolution] += result.rowcount
+                    start = chunk_end
+
+                watermarks[resolution] = start
+                self.watermarks[resolution] = start
+
+        self.runs += 1
+        self.last_run = datetime.utcnow()
+
+    def get_stats(self):
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "buckets_written": {str(resolution): count for resolution, count in self.buckets_written.items()},
+            "watermarks": {
+                str(resolution): watermark.isoformat() if watermark else None
+                for resolution, watermark in self.watermarks.items()
+            }
+        }
+
+
+class TelemetryRollupRetention:
+    """
+    Job that deletes rollup buckets past their resolution's retention, scheduled by the janitor.
+
+    Buckets a coarser level has not been built from yet are kept whatever their
+    age, so expiring a source level never leaves a hole in the level above it.
+    """
+
+    def __init__(self, retention_days: Dict[int, int], batch_size: int):
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self.buckets_deleted: Dict[int, int] = {resolution: 0 for resolution in ROLLUP_RESOLUTIONS}
+
+    async def run_once(self) -> Dict[int, int]:
+        now = datetime.now(timezone.utc)
+        deleted = {resolution: 0 for resolution in ROLLUP_RESOLUTIONS}
+        async with AsyncSessionLocal() as db:
+            stored = await db.execute(select(TelemetryRollupWatermark))
+            watermarks = {row.resolution_seconds: row.watermark for row in stored.scalars().all()}
+
+            for resolution in ROLLUP_RESOLUTIONS:
+                cutoff = now - timedelta(days=self.retention_days[resolution])
+                for consumer, source in ROLLUP_LEVELS:
+                    if source == resolution:
+                        built_until = watermarks.get(consumer)
+                        cutoff = min(cutoff, built_until) if built_until else None
+                        break
+                if cutoff is None:
+                    continue
+
+                while True:
+                    result = await db.execute(EXPIRE_ROLLUPS, {
+                        "resolution": resolution,
+                        "cutoff": cutoff,
+                        "batch": self.batch_size
+                    })
+                    await db.commit()
+                    deleted[resolution] += result.rowcount
+                    if result.rowcount < self.batch_size:
+                        break
+
+        self.runs += 1
+        self.last_run = datetime.utcnow()
+        for resolution, count in deleted.items():
+            self.buckets_deleted[resolution] += count
+        if any(deleted.values()):
+            logger.info(
+                "Expired telemetry rollups: "
+                + ", ".join(f"{count} x {resolution}s" for resolution, count in deleted.items() if count)
+            )
+        return deleted
+
+    def get_stats(self):
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "buckets_deleted": {str(resolution): count for resolution, count in self.buckets_deleted.items()},
+            "retention_days": {str(resolution): days for resolution, days in self.retention_days.items()}
+        }
+
+
+telemetry_rollups = TelemetryRollupJob(
+    lag_seconds=(
+        settings.telemetry_max_lateness_seconds
+        + math.ceil(settings.telemetry_flush_interval_ms / 1000)
+        + settings.telemetry_rollup_lag_seconds
+    ),
+    chunk_seconds=settings.telemetry_rollup_chunk_seconds
+)
+
+telemetry_rollup_retention = TelemetryRollupRetention(
+    retention_days={
+        10: settings.telemetry_rollup_retention_days_10s,
+        60: settings.telemetry_rollup_retention_days_60s
+    },
+    batch_size=settings.telemetry_rollup_delete_batch
+)
@@ -1,32 +1,70 @@
 # app/monitoring/router.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func, delete, text
-from datetime import datetime, timedelta
+from sqlalchemy import select, and_, desc, func, text
+from datetime import datetime, timedelta, timezone
 import json
 import asyncio
+import time
 import h3
+import numpy as np
 from typing import Dict, Set
-from collections import defaultdict
+from collections import defaultdict, deque
 
+from ..config import settings
 from ..database import get_db, AsyncSessionLocal
-from ..auth.utils import get_current_active_user
+from ..auth.utils import get_current_active_user, get_user_from_token
 from ..auth.models import User
 from ..drones.models import Drone
-from ..flights.models import FlightRequest, RestrictedZone
+from ..flights.models import FlightRequest
 from .models import TelemetryData, Alert, HexGridCell, CurrentDronePosition
 from .schemas import (
     TelemetryData as TelemetryDataSchema,
+    TelemetryRollup as TelemetryRollupSchema,
+    DroneTrack,
     Alert as AlertSchema,
     DroneStatus,
     MonitoringDashboard,
     WebSocketMessage,
     ZoneDroneCount,
-    TelemetryDataCreate
+    TelemetryDataCreate,
+    TelemetryBatchResult
+)
+from .ingest import position_watermarks
+from .position_bus import position_bus, PositionSubscription, PositionUpdate
+from .notify import airspace_events
+from .zones import zone_monitor, AIRBORNE_STATUSES
+from .ingest_queue import ingest_queue, IngestOverloaded
+from .occupancy import hex_reconciler
+from .janitor import janitor
+from .partitions import telemetry_partitions
+from .rollups import telemetry_rollups, telemetry_rollup_retention, ROLLUP_RESOLUTIONS
+from .export import stream_telemetry_export, EXPORT_FORMATS
+from .history import (
+    telemetry_history_query,
+    stream_history_ndjson,
+    history_cursor,
+    history_schema,
+    InvalidCursor,
+    NDJSON_MEDIA_TYPE
+)
+from .hex_index import hex_index, HexCellRef
+from .viewports import ViewportIndex, InvalidSubscription, parse_bbox, parse_cells
+from .write_behind import telemetry_buffer
+from .deadband import telemetry_deadband
+from .wire_format import (
+    decode_telemetry_records,
+    is_binary_content_type,
+    WireFormatError,
+    TELEMETRY_RECORD_SIZE,
+    BINARY_CONTENT_TYPE
 )
 from ..utils.logger import setup_logger
-from ..utils.geospatial import point_in_circle
+from ..utils.track_simplify import simplify_track, meters_per_pixel
 
 router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
 logger = setup_logger("utm.monitoring")
@@ -37,9 +75,11 @@ class MonitoringMetrics:
     def __init__(self):
         self.telemetry_processed = 0
         self.telemetry_errors = 0
-        self.zone_violations = 0
         self.websocket_connections = 0
+        self.ingest_connections = 0
         self.processing_times = []
+        # Samples decoded and time spent decoding, per wire format ("json" / "binary")
+        self.decode_stats = defaultdict(lambda: {"samples": 0, "time_ms": 0.0})
         self.last_reset = datetime.utcnow()
 
     def record_processing_time(self, time_ms: float):
@@ -48,6 +88,10 @@ class MonitoringMetrics:
         if len(self.processing_times) > 1000:
             self.processing_times = self.processing_times[-1000:]
 
+    def record_decode(self, wire_format: str, samples: int, time_ms: float):
+        self.decode_stats[wire_format]["samples"] += samples
+        self.decode_stats[wire_format]["time_ms"] += time_ms
+
     def get_stats(self):
         uptime = (datetime.utcnow() - self.last_reset).total_seconds()
         avg_processing_time = sum(self.processing_times) / len(self.processing_times) if self.processing_times else 0
@@ -55,279 +99,646 @@ class MonitoringMetrics:
         return {
             "telemetry_processed": self.telemetry_processed,
             "telemetry_errors": self.telemetry_errors,
-            "zone_violations": self.zone_violations,
+            "zone_violations": zone_monitor.violations,
             "websocket_connections": self.websocket_connections,
+            "ingest_connections": self.ingest_connections,
             "uptime_seconds": uptime,
             "telemetry_rate": self.telemetry_processed / uptime if uptime > 0 else 0,
             "avg_processing_time_ms": avg_processing_time,
-            "error_rate": self.telemetry_errors / self.telemetry_processed if self.telemetry_processed > 0 else 0
+            "error_rate": self.telemetry_errors / self.telemetry_processed if self.telemetry_processed > 0 else 0,
+            "hex_index": hex_index.get_stats(),
+            "ingest_queue": ingest_queue.get_stats(),
+            "position_watermarks": position_watermarks.get_stats(),
+            "deadband": telemetry_deadband.get_stats(),
+            "telemetry_partitions": telemetry_partitions.get_stats(),
+            "telemetry_rollups": telemetry_rollups.get_stats(),
+            "telemetry_rollup_retention": telemetry_rollup_retention.get_stats(),
+            "write_behind": telemetry_buffer.get_stats(),
+            "hex_reconciliation": hex_reconciler.get_stats(),
+            "janitor": janitor.get_stats(),
+            "airspace_broadcast": airspace_broadcaster.get_stats(),
+            "position_bus": position_bus.get_stats(),
+            "airspace_events": airspace_events.get_stats(),
+            "zone_monitor": zone_monitor.get_stats(),
+            "decode": {
+                wire_format: {
+                    "samples": stats["samples"],
+                    "avg_decode_time_us": stats["time_ms"] * 1000 / stats["samples"] if stats["samples"] else 0
+                }
+                for wire_format, stats in self.decode_stats.items()
+            }
         }
 
 
 metrics = MonitoringMetrics()
 
 
-class RestrictedZoneCache:
-    def __init__(self, ttl_seconds: int = 300):  # 5 minute cache
-        self.zones: List[RestrictedZone] = []
-        self.last_update = None
-        self.ttl_seconds = ttl_seconds
-        self.lock = asyncio.Lock()
+# Viewports of the WebSocket viewers that subscribed to a region
+viewport_index = ViewportIndex()
 
-    async def get_zones(self, db: AsyncSession) -> List[RestrictedZone]:
-        async with self.lock:
-            now = datetime.utcnow()
+# WebSocket frame modes: "full" sends the whole visible airspace whenever it changes,
+# "delta" sends a snapshot then sequenced airspace_delta frames with changed fields only
+FRAME_MODE_FULL = "full"
+FRAME_MODE_DELTA = "delta"
 
-            if (not self.last_update or
-                    (now - self.last_update).total_seconds() > self.ttl_seconds):
-                # Refresh cache
-                result = await db.execute(
-                    select(RestrictedZone).where(RestrictedZone.is_active == True)
-                )
-                self.zones = result.scalars().all()
-                self.last_update = now
-                logger.info(f"Refreshed restricted zone cache: {len(self.zones)} zones")
 
-            return self.zones
+class Viewer:
+    """One /monitoring/ws connection, its frame mode and what it was last sent"""
 
+    def __init__(self, websocket: WebSocket, mode: str, queue_size: int):
+        self.websocket = websocket
+        self.mode = mode
+        # Drones the viewer currently holds and the seq of the last frame it got;
+        # only tracked per viewer when a viewport filters its frames
+        self.visible: Set[int] = set()
+        self.last_seq = 0
+        # Serialized messages waiting for this viewer's writer task
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        # Set when the queue overflowed: frames are skipped until the writer catches up
+        self.lagging = False
 
-zone_cache = RestrictedZoneCache()
 
-
-async def check_restricted_zone_violation_optimized(
-        drone_id: int,
-        latitude: float,
-        longitude: float,
-        altitude: float,
-        db: AsyncSession
-) -> Optional[dict]:
+# WebSocket connection manager
+class ConnectionManager:
     """
-    Optimized zone violation check using cached zones
+    WebSocket viewers and their outbound queues.
+
+    Messages are serialized once by the caller and put on each viewer's bounded
+    queue without awaiting; a writer task per viewer drains its queue onto the
+    socket. A stalled viewer therefore can't hold up anyone else. When a
+    viewer's queue overflows it is downgraded: queued frames are discarded,
+    further frames skipped, and once its writer catches up it gets a fresh
+    snapshot and continues from there. A viewer whose socket accepts nothing for
+    send_timeout_seconds is disconnected.
     """
-    try:
-        zones = await zone_cache.get_zones(db)
-
-        for zone in zones:
-            # Quick distance check
-            if point_in_circle(latitude, longitude, zone.center_lat, zone.center_lng, zone.radius):
-                # Check altitude
-                if altitude > zone.max_altitude:
-                    metrics.zone_violations += 1
-                    return {
-                        "zone_id": zone.id,
-                        "zone_name": zone.name,
-                        "zone_type": "restricted",
-                        "severity": "high",
-                        "message": f"Drone entered restricted zone: {zone.name} (altitude: {altitude}m exceeds max: {zone.max_altitude}m)"
-                    }
+
+    def __init__(self, queue_size: int, send_timeout_seconds: float):
+        self.queue_size = queue_size
+        self.send_timeout_seconds = send_timeout_seconds
+        self.viewers: List[Viewer] = []
+        self.bytes_sent: Dict[str, int] = defaultdict(int)
+        self.frames_skipped = 0
+        self.downgraded = 0
+        self.dropped = 0
+
+    async def connect(self, websocket: WebSocket, mode: str = FRAME_MODE_FULL) -> Viewer:
+        await websocket.accept()
+        viewer = Viewer(websocket, mode, self.queue_size)
+        viewer.writer = asyncio.create_task(self._write(viewer))
+        self.viewers.append(viewer)
+        metrics.websocket_connections = len(self.viewers)
+        return viewer
+
+    def disconnect(self, viewer: Viewer):
+        if viewer in self.viewers:
+            self.viewers.remove(viewer)
+        viewport_index.remove(viewer)
+        if viewer.writer and viewer.writer is not asyncio.current_task():
+            viewer.writer.cancel()
+        metrics.websocket_connections = len(self.viewers)
+
+    async def _write(self, viewer: Viewer):
+        try:
+            while True:
+                if viewer.lagging and viewer.queue.empty():
+                    # Caught up after falling behind, restart from a snapshot instead of the skipped frames
+                    viewer.lagging = False
+                    payload = json.dumps(airspace_broadcaster.snapshot_message(viewer))
                 else:
-                    metrics.zone_violations += 1
-                    return {
-                        "zone_id": zone.id,
-                        "zone_name": zone.name,
-                        "zone_type": "restricted",
-                        "severity": "medium",
-                        "message": f"Drone entered restricted zone: {zone.name}"
-                    }
+                    payload = await viewer.queue.get()
+                await asyncio.wait_for(viewer.websocket.send_text(payload), self.send_timeout_seconds)
+                self.bytes_sent[viewer.mode] += len(payload)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logger.warning(f"Dropping WebSocket viewer, no send progress in {self.send_timeout_seconds}s")
+            try:
+                await asyncio.wait_for(viewer.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER), 1.0)
+            except Exception:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        self.disconnect(viewer)
+
+    def offer(self, viewer: Viewer, payload: str):
+        """Queue a serialized message for the viewer without waiting on its socket"""
+        if viewer.lagging:
+            self.frames_skipped += 1
+            return
+        try:
+            viewer.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Slow consumer: throw away what it hasn't read, it gets a snapshot once caught up
+            while not viewer.queue.empty():
+                viewer.queue.get_nowait()
+                self.frames_skipped += 1
+            viewer.lagging = True
+            self.downgraded += 1
+
+    def send(self, viewer: Viewer, message: dict):
+        self.offer(viewer, json.dumps(message))
+
+    def send_payloads(self, payloads: List[tuple]):
+        """Queue (viewer, serialized message) pairs"""
+        for viewer, payload in payloads:
+            self.offer(viewer, payload)
+
+    def broadcast(self, message: dict, viewers: Optional[List[Viewer]] = None):
+        """Send to every viewer, or only to the given ones"""
+        # Serialize once, every viewer's queue gets the same string
+        payload = json.dumps(message)
+        for viewer in (self.viewers if viewers is None else viewers):
+            self.offer(viewer, payload)
 
-        return None
+    def get_stats(self):
+        modes = [viewer.mode for viewer in self.viewers]
+        return {
+            "connections": {mode: modes.count(mode) for mode in (FRAME_MODE_FULL, FRAME_MODE_DELTA)},
+            "bytes_sent": dict(self.bytes_sent),
+            "max_queue_depth": max((viewer.queue.qsize() for viewer in self.viewers), default=0),
+            "lagging": sum(viewer.lagging for viewer in self.viewers),
+            "frames_skipped": self.frames_skipped,
+            "downgraded": self.downgraded,
+            "dropped": self.dropped,
+            "viewport_index": viewport_index.get_stats()
+        }
 
-    except Exception as e:
-        logger.error(f"Error checking restricted zone: {str(e)}", exc_info=True)
-        return None
 
+manager = ConnectionManager(settings.websocket_send_queue_size, settings.websocket_send_timeout_seconds)
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+def broadcast_all_workers(message: dict):
+    """Broadcast to this worker's viewers and relay to the other workers' viewers"""
+    manager.broadcast(message)
+    airspace_events.publish_message(message)
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
 
-    async def broadcast(self, message: dict):
-        dead_connections = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                dead_connections.append(connection)
+def replay_remote_messages(messages: list):
+    for message in messages:
+        manager.broadcast(message)
 
-        # Clean up dead connections
-        for connection in dead_connections:
-            self.disconnect(connection)
 
+airspace_events.subscribe("messages", replay_remote_messages)
 
-manager = ConnectionManager()
 
+def publish_zone_events(alerts: List[dict], exits: List[dict]):
+    if alerts:
+        broadcast_all_workers({
+            "type": "restricted_zone_alert",
+            "data": alerts
+        })
+    if exits:
+        broadcast_all_workers({
+            "type": "restricted_zone_exit",
+            "data": exits
+        })
 
-@router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        # Store last known positions to detect zone entries
-        last_positions = {}
 
-        while True:
-            # Keep connection alive and send periodic updates
-            await asyncio.sleep(1)
+def relay_zone_transitions(alerts: List[dict], exits: List[dict]):
+    """Keep the other workers' zone membership in step with what this worker recorded"""
+    airspace_events.publish_event("zone_transitions", {
+        "entered": [[alert["drone_id"], alert["zone_id"]] for alert in alerts],
+        "exited": [[zone_exit["drone_id"], zone_exit["zone_id"]] for zone_exit in exits]
+    })
+
+
+def replay_remote_zone_transitions(items: list):
+    for item in items:
+        zone_monitor.apply_transitions(
+            [tuple(entry) for entry in item["entered"]],
+            [tuple(entry) for entry in item["exited"]]
+        )
+
+
+zone_monitor.add_listener(publish_zone_events)
+zone_monitor.add_listener(relay_zone_transitions)
+airspace_events.subscribe("zone_transitions", replay_remote_zone_transitions)
 
-            # Get current drone positions instead of telemetry for efficiency
+
+def add_hex_cells(items: list):
+    """Hex cells created since the index was loaded, as [h3_index, id, center_lat, center_lng]"""
+    for h3_index, cell_id, center_lat, center_lng in items:
+        hex_index.add(h3_index, HexCellRef(cell_id, center_lat, center_lng))
+
+
+airspace_events.subscribe("hex_cells", add_hex_cells)
+
+
+class AirspaceBroadcaster:
+    """
+    Pushes airspace frames to WebSocket viewers straight from the ingest path.
+
+    Accepted position updates arrive through the position bus and are coalesced
+    per drone, then sent at most max_frame_rate times per second. Full mode
+    viewers get telemetry_update frames holding every drone they can see, so a
+    drone that lands or goes stale is simply missing from the next one. Delta
+    mode viewers get an airspace_snapshot on connect, then airspace_delta frames
+    with seq and prev_seq, the changed fields of updated drones (drone_info only
+    when a drone appears) and the ids of removed drones, plus a snapshot every
+    keyframe_interval_seconds. A delta applies on top of the snapshot or delta
+    whose seq equals its prev_seq; on a gap the client sends {"type": "resync"}
+    and is answered with a fresh snapshot.
+
+    Viewers with a viewport (see viewport_index) only get the drones inside it.
+    Their frames are built from the viewport index matches of the updated drones;
+    in delta mode drones leaving the viewport come as removed and drones
+    entering it as full records. Identical frames are serialized once.
+
+    The broadcaster keeps the current airspace in memory. Drones that go quiet
+    for stale_seconds or leave airborne/hovering status drop out of it, along
+    with everything else it keeps per drone.
+    """
+
+    def __init__(
+            self,
+            max_frame_rate: float,
+            keyframe_interval_seconds: int,
+            max_lateness_seconds: int,
+            stale_seconds: int = 30
+    ):
+        self.min_frame_interval = 1 / max_frame_rate
+        self.keyframe_interval_seconds = keyframe_interval_seconds
+        self.max_lateness_seconds = max_lateness_seconds
+        self.stale_seconds = stale_seconds
+        self.is_running = False
+        self.subscription: Optional[PositionSubscription] = None
+        # drone_id -> latest frame record, and when it was last updated (monotonic)
+        self.airspace: Dict[int, dict] = {}
+        self.last_seen: Dict[int, float] = {}
+        # drone_id -> device timestamp of the last sample applied, kept after a landing
+        # so a late relayed airborne sample doesn't bring the drone back, until it is
+        # older than the lateness bound and ingest refuses anything older anyway
+        self.sample_times: Dict[int, datetime] = {}
+        # drone_id -> brand/model/serial of the drones in the airspace, drone info
+        # doesn't change in flight
+        self.drone_info: Dict[int, dict] = {}
+        # Drones dropped since the last frame, sent as removed in the next delta
+        self.removed: Set[int] = set()
+        self.seq = 0
+        self.last_keyframe = time.monotonic()
+
+        self.frames = 0
+        self.keyframes = 0
+        self.out_of_order = 0
+        self.frame_times = deque(maxlen=1000)
+        self.latencies_ms = deque(maxlen=10000)
+
+    async def start(self):
+        """Subscribe to the position bus and start the frame loop"""
+        logger.info(f"Starting airspace broadcaster at up to {1 / self.min_frame_interval:.0f} frames/s")
+        self.subscription = position_bus.subscribe()
+        self.is_running = True
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self.subscription.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            if not self.is_running:
+                break
+
+            frame_start = time.monotonic()
+            try:
+                self.prune_stale(frame_start)
+                await self.publish_frame(self.subscription.drain())
+            except Exception as e:
+                logger.error(f"Airspace broadcast error: {e}", exc_info=True)
+
+            # Coalesce whatever arrives in the meantime into the next frame
+            await asyncio.sleep(max(0.0, self.min_frame_interval - (time.monotonic() - frame_start)))
+
+        position_bus.unsubscribe(self.subscription)
+
+    def stop(self):
+        """Stop the frame loop"""
+        self.is_running = False
+        if self.subscription:
+            self.subscription.wake()
+
+    def snapshot(self) -> List[dict]:
+        return list(self.airspace.values())
+
+    def viewer_records(self, viewer: Viewer) -> List[dict]:
+        if not viewport_index.is_filtered(viewer):
+            return self.snapshot()
+        return [
+            record for record in self.airspace.values()
+            if viewer in viewport_index.match(record["latitude"], record["longitude"])
+        ]
+
+    def snapshot_message(self, viewer: Viewer, records: Optional[List[dict]] = None) -> dict:
+        """Everything the viewer can see; for delta viewers this is the base for the next deltas"""
+        records = self.viewer_records(viewer) if records is None else records
+        viewer.visible = {record["drone_id"] for record in records}
+        viewer.last_seq = self.seq
+        if viewer.mode == FRAME_MODE_DELTA:
+            return {"type": "airspace_snapshot", "seq": self.seq, "data": records}
+        return {"type": "telemetry_update", "data": records}
+
+    def remove_drone(self, drone_id: int):
+        if self.airspace.pop(drone_id, None) is not None:
+            self.removed.add(drone_id)
+        self.last_seen.pop(drone_id, None)
+        self.drone_info.pop(drone_id, None)
+
+    def frame_record(self, sample: TelemetryDataCreate) -> dict:
+        return {
+            "drone_id": sample.drone_id,
+            "drone_info": self.drone_info.get(sample.drone_id, {}),
+            "latitude": sample.latitude,
+            "longitude": sample.longitude,
+            "altitude": sample.altitude,
+            "speed": sample.speed,
+            "heading": sample.heading,
+            "battery_level": sample.battery_level,
+            "status": sample.status,
+            "timestamp": sample.timestamp.isoformat(),
+            "flight_request_id": sample.flight_request_id
+        }
+
+    async def load_drone_info(self, db: AsyncSession, drone_ids: Set[int]):
+        missing = drone_ids - self.drone_info.keys()
+        if not missing:
+            return
+        result = await db.execute(select(Drone).where(Drone.id.in_(missing)))
+        for drone in result.scalars().all():
+            self.drone_info[drone.id] = {
+                "brand": drone.brand,
+                "model": drone.model,
+                "serial_number": drone.serial_number
+            }
+
+    async def publish_frame(self, updates: List[PositionUpdate]):
+        start = time.perf_counter()
+
+        if updates:
             async with AsyncSessionLocal() as db:
-                # Get all current drone positions with drone info
-                result = await db.execute(
-                    select(CurrentDronePosition, Drone)
-                    .join(Drone, CurrentDronePosition.drone_id == Drone.id)
-                    .where(CurrentDronePosition.status.in_(["airborne", "hovering"]))
-                )
-                current_positions = result.all()
-
-                if current_positions:
-                    drone_telemetry = {}
-                    restricted_zone_alerts = []
-
-                    for position, drone in current_positions:
-                        # Check if position was updated recently (within last 30 seconds)
-                        if (datetime.utcnow() - position.last_update).total_seconds() > 30:
-                            continue
-
-                        drone_telemetry[position.drone_id] = {
-                            "drone_id": position.drone_id,
-                            "drone_info": {
-                                "brand": drone.brand,
-                                "model": drone.model,
-                                "serial_number": drone.serial_number
-                            },
-                            "latitude": position.latitude,
-                            "longitude": position.longitude,
-                            "altitude": position.altitude,
-                            "speed": position.speed,
-                            "heading": position.heading,
-                            "battery_level": position.battery_level,
-                            "status": position.status,
-                            "timestamp": position.last_update.isoformat(),
-                            "flight_request_id": position.flight_request_id
-                        }
-
-                        # Check for restricted zone violations
-                        violation = await check_restricted_zone_violation_optimized(
-                            position.drone_id,
-                            position.latitude,
-                            position.longitude,
-                            position.altitude,
-                            db
-                        )
-
-                        if violation:
-                            # Check if this is a new violation
-                            last_pos = last_positions.get(position.drone_id)
-                            is_new_violation = True
-
-                            if last_pos:
-                                last_violation = await check_restricted_zone_violation_optimized(
-                                    position.drone_id,
-                                    last_pos['latitude'],
-                                    last_pos['longitude'],
-                                    last_pos['altitude'],
-                                    db
-                                )
-                                if last_violation and last_violation['zone_id'] == violation['zone_id']:
-                                    is_new_violation = False
-
-                            if is_new_violation:
-                                # Check if alert already exists
-                                existing_alert = await db.execute(
-                                    select(Alert)
-                                    .where(
-                                        and_(
-                                            Alert.drone_id == position.drone_id,
-                                            Alert.alert_type == "restricted_zone_violation",
-                                            Alert.is_resolved == False,
-                                            Alert.created_at > datetime.utcnow() - timedelta(minutes=5)
-                                        )
-                                    )
-                                )
-                                if not existing_alert.scalar_one_or_none():
-                                    # Create alert in database
-                                    alert = Alert(
-                                        drone_id=position.drone_id,
-                                        flight_request_id=position.flight_request_id,
-                                        alert_type="restricted_zone_violation",
-                                        severity=violation['severity'],
-                                        message=violation['message'],
-                                        latitude=position.latitude,
-                                        longitude=position.longitude,
-                                        altitude=position.altitude
-                                    )
-                                    db.add(alert)
-                                    await db.commit()
-                                    await db.refresh(alert)
-
-                                    # Add to alerts list
-                                    restricted_zone_alerts.append({
-                                        "alert_id": alert.id,
-                                        "drone_id": position.drone_id,
-                                        "zone_id": violation['zone_id'],
-                                        "zone_name": violation['zone_name'],
-                                        "zone_type": violation['zone_type'],
-                                        "severity": violation['severity'],
-                                        "message": violation['message'],
-                                        "latitude": position.latitude,
-                                        "longitude": position.longitude,
-                                        "altitude": position.altitude,
-                                        "timestamp": datetime.utcnow().isoformat()
-                                    })
-
-                        # Update last known position
-                        last_positions[position.drone_id] = {
-                            'latitude': position.latitude,
-                            'longitude': position.longitude,
-                            'altitude': position.altitude
-                        }
-
-                    # Send telemetry update
-                    if drone_telemetry:
-                        await websocket.send_text(json.dumps({
+                await self.load_drone_info(db, {
+                    update.sample.drone_id for update in updates if update.sample.status in AIRBORNE_STATUSES
+                })
+
+        # Apply the whole frame without awaiting, so a snapshot never holds half a frame
+        records: Dict[int, dict] = {}
+        changes: Dict[int, dict] = {}
+        for update in updates:
+            sample = update.sample
+            # Positions relayed from other workers arrive late; never let one
+            # overwrite a newer sample that was already applied
+            applied = self.sample_times.get(sample.drone_id)
+            if applied is not None and sample.timestamp < applied:
+                self.out_of_order += 1
+                continue
+            self.sample_times[sample.drone_id] = sample.timestamp
+            if sample.status not in AIRBORNE_STATUSES:
+                self.remove_drone(sample.drone_id)
+                continue
+
+            record = self.frame_record(sample)
+            previous = self.airspace.get(sample.drone_id)
+            self.airspace[sample.drone_id] = record
+            self.last_seen[sample.drone_id] = update.received_at
+            self.removed.discard(sample.drone_id)
+            records[sample.drone_id] = record
+            changes[sample.drone_id] = record_delta(previous, record)
+        removed = sorted(self.removed)
+        self.removed = set()
+
+        keyframe = time.monotonic() - self.last_keyframe >= self.keyframe_interval_seconds
+        if records or removed:
+            self.seq += 1
+            payloads = self.unfiltered_payloads(records, changes, removed, keyframe)
+            payloads += self.filtered_payloads(records, changes, removed, keyframe)
+            manager.send_payloads(payloads)
+
+            sent_at = time.monotonic()
+            self.latencies_ms.extend((sent_at - update.received_at) * 1000 for update in updates)
+            self.frames += 1
+            self.frame_times.append((time.perf_counter() - start) * 1000)
+        elif keyframe:
+            # Quiet airspace still gets keyframes, so a viewer that missed a delta recovers
+            manager.send_payloads(
+                self.unfiltered_payloads({}, {}, [], True) + self.filtered_payloads({}, {}, [], True)
+            )
+        if keyframe:
+            self.last_keyframe = time.monotonic()
+            self.keyframes += 1
+
+    def unfiltered_payloads(
+            self,
+            records: Dict[int, dict],
+            changes: Dict[int, dict],
+            removed: List[int],
+            keyframe: bool
+    ) -> List[tuple]:
+        """Frame for viewers without a viewport, serialized once per mode"""
+        payloads = []
+        viewers = [viewer for viewer in manager.viewers if not viewport_index.is_filtered(viewer)]
+
+        full_viewers = [viewer for viewer in viewers if viewer.mode == FRAME_MODE_FULL]
+        if (records or removed) and full_viewers:
+            payload = json.dumps({"type": "telemetry_update", "data": self.snapshot()})
+            payloads.extend((viewer, payload) for viewer in full_viewers)
+
+        delta_viewers = [viewer for viewer in viewers if viewer.mode == FRAME_MODE_DELTA]
+        if delta_viewers:
+            if keyframe:
+                message = {"type": "airspace_snapshot", "seq": self.seq, "data": self.snapshot()}
+            else:
+                message = {
+                    "type": "airspace_delta",
+                    "seq": self.seq,
+                    "prev_seq": self.seq - 1,
+                    "updated": list(changes.values()),
+                    "removed": removed
+                }
+            payload = json.dumps(message)
+            for viewer in delta_viewers:
+                viewer.last_seq = self.seq
+                payloads.append((viewer, payload))
+        return payloads
+
+    def filtered_payloads(
+            self,
+            records: Dict[int, dict],
+            changes: Dict[int, dict],
+            removed: List[int],
+            keyframe: bool
+    ) -> List[tuple]:
+        """Per-viewport frames, serialized once per distinct frame"""
+        viewers = [viewer for viewer in manager.viewers if viewport_index.is_filtered(viewer)]
+        if not viewers:
+            return []
+
+        # viewer -> drones of this frame (or of the whole airspace on a keyframe) inside its viewport
+        in_view: Dict[Viewer, List[int]] = defaultdict(list)
+        for record in (self.airspace.values() if keyframe else records.values()):
+            for viewer in viewport_index.match(record["latitude"], record["longitude"]):
+                in_view[viewer].append(record["drone_id"])
+
+        payloads = []
+        serialized: Dict[tuple, str] = {}
+        removed_ids = set(removed)
+        for viewer in viewers:
+            visible = sorted(in_view.get(viewer, ()))
+            if keyframe and viewer.mode == FRAME_MODE_DELTA:
+                key = ("snapshot", tuple(visible))
+                if key not in serialized:
+                    serialized[key] = json.dumps({
+                        "type": "airspace_snapshot",
+                        "seq": self.seq,
+                        "data": [self.airspace[drone_id] for drone_id in visible]
+                    })
+                viewer.visible = set(visible)
+                viewer.last_seq = self.seq
+                payloads.append((viewer, serialized[key]))
+                continue
+
+            if viewer.mode == FRAME_MODE_FULL:
+                if keyframe:
+                    current = set(visible)
+                else:
+                    # Drones of this frame outside the viewport, or removed, drop out of view
+                    current = (viewer.visible - removed_ids - records.keys()) | {
+                        drone_id for drone_id in visible if drone_id in records
+                    }
+                if current != viewer.visible or not current.isdisjoint(records):
+                    key = ("full", tuple(sorted(current)))
+                    if key not in serialized:
+                        serialized[key] = json.dumps({
                             "type": "telemetry_update",
-                            "data": list(drone_telemetry.values())
-                        }))
-
-                    # Send restricted zone alerts if any
-                    if restricted_zone_alerts:
-                        await websocket.send_text(json.dumps({
-                            "type": "restricted_zone_alert",
-                            "data": restricted_zone_alerts
-                        }))
-
-                        # Also broadcast to all connected clients
-                        await manager.broadcast({
-                            "type": "restricted_zone_alert",
-                            "data": restricted_zone_alerts
+                            "data": [self.airspace[drone_id] for drone_id in key[1]]
                         })
+                    payloads.append((viewer, serialized[key]))
+                viewer.visible = current
+                continue
+
+            visible = [drone_id for drone_id in visible if drone_id in records]
+
+            # Drones that left the viewport or the airspace since this viewer's last frame
+            gone = sorted(
+                drone_id for drone_id in viewer.visible
+                if drone_id in removed_ids or (drone_id in records and drone_id not in visible)
+            )
+            if not visible and not gone:
+                continue
+            known = tuple(drone_id in viewer.visible for drone_id in visible)
+            key = ("delta", viewer.last_seq, tuple(visible), known, tuple(gone))
+            if key not in serialized:
+                serialized[key] = json.dumps({
+                    "type": "airspace_delta",
+                    "seq": self.seq,
+                    "prev_seq": viewer.last_seq,
+                    "updated": [
+                        changes[drone_id] if was_visible else records[drone_id]
+                        for drone_id, was_visible in zip(visible, known)
+                    ],
+                    "removed": gone
+                })
+            viewer.visible = (viewer.visible - set(gone)) | set(visible)
+            viewer.last_seq = self.seq
+            payloads.append((viewer, serialized[key]))
+        return payloads
+
+    def prune_stale(self, now: float):
+        """Drop drones that stopped reporting from the in-memory airspace"""
+        for drone_id in [d for d, seen in self.last_seen.items() if now - seen > self.stale_seconds]:
+            self.remove_drone(drone_id)
+            self.sample_times.pop(drone_id, None)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.max_lateness_seconds)
+        for drone_id in [d for d, sampled in self.sample_times.items() if sampled < cutoff and d not in self.airspace]:
+            del self.sample_times[drone_id]
+
+    def get_stats(self):
+        latencies = sorted(self.latencies_ms)
+        return {
+            "viewers": len(manager.viewers),
+            "airspace_drones": len(self.airspace),
+            "tracked_drones": len(self.sample_times),
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "out_of_order_skipped": self.out_of_order,
+            "seq": self.seq,
+            "avg_frame_ms": sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0,
+            "max_frame_ms": max(self.frame_times) if self.frame_times else 0,
+            # Ingest receive to frame sent, over the last 10k position updates
+            "latency_ms": {
+                "avg": sum(latencies) / len(latencies) if latencies else 0,
+                "p50": latencies[len(latencies) // 2] if latencies else 0,
+                "p95": latencies[int(len(latencies) * 0.95)] if latencies else 0,
+                "max": latencies[-1] if latencies else 0
+            },
+            **manager.get_stats()
+        }
+
+
+def record_delta(previous: Optional[dict], record: dict) -> dict:
+    """Fields of record that differ from previous; a new drone gets its full record"""
+    if previous is None:
+        return record
+    delta = {"drone_id": record["drone_id"]}
+    delta.update((key, value) for key, value in record.items() if previous.get(key) != value)
+    return delta
+
+
+airspace_broadcaster = AirspaceBroadcaster(
+    settings.airspace_max_frame_rate,
+    settings.airspace_keyframe_interval_seconds,
+    settings.telemetry_max_lateness_seconds
+)
 
-                # Clean up stale positions (older than 5 minutes)
-                stale_time = datetime.utcnow() - timedelta(minutes=5)
-                await db.execute(
-                    delete(CurrentDronePosition)
-                    .where(
-                        and_(
-                            CurrentDronePosition.last_update < stale_time,
-                            CurrentDronePosition.status.in_(["landed", "emergency", "disconnected"])
-                        )
-                    )
-                )
-                await db.commit()
 
+@router.websocket("/ws")
+async def websocket_endpoint(
+        websocket: WebSocket,
+        mode: str = Query(FRAME_MODE_FULL, pattern=f"^({FRAME_MODE_FULL}|{FRAME_MODE_DELTA})$")
+):
+    """
+    Airspace feed. A snapshot of the current airspace is sent on connect, after that
+    airspace_broadcaster pushes frames in the requested mode (see AirspaceBroadcaster).
+
+    Client messages:
+      {"type": "resync"}: send a fresh snapshot
+      {"type": "subscribe", "bbox": [min_lng, min_lat, max_lng, max_lat], "h3_cells": [...], "replace": true}:
+        only receive drones inside the bbox and/or H3 cells (any resolution); with
+        replace the viewport is swapped for the new region, otherwise extended
+      {"type": "unsubscribe", "bbox": [...], "h3_cells": [...]}: remove a region from
+        the viewport; without a region, go back to receiving the whole airspace
+    Subscription changes are answered with a snapshot of the new viewport.
+    Alerts are sent to every viewer regardless of viewport.
+    """
+    viewer = await manager.connect(websocket, mode)
+    try:
+        manager.send(viewer, airspace_broadcaster.snapshot_message(viewer))
+
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(message, dict):
+                continue
+
+            message_type = message.get("type")
+            if message_type in ("subscribe", "unsubscribe"):
+                try:
+                    bbox = parse_bbox(message["bbox"]) if message.get("bbox") is not None else None
+                    cells = parse_cells(message["h3_cells"]) if message.get("h3_cells") is not None else None
+                except InvalidSubscription as e:
+                    manager.send(viewer, {"type": "error", "message": str(e)})
+                    continue
+                if message_type == "subscribe":
+                    viewport_index.subscribe(viewer, bbox, cells, replace=bool(message.get("replace")))
+                else:
+                    viewport_index.unsubscribe(viewer, bbox, cells)
+                manager.send(viewer, airspace_broadcaster.snapshot_message(viewer))
+            elif message_type == "resync":
+                manager.send(viewer, airspace_broadcaster.snapshot_message(viewer))
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        manager.disconnect(viewer)
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
-        manager.disconnect(websocket)
+        manager.disconnect(viewer)
 
 
 @router.get("/dashboard", response_model=MonitoringDashboard)
@@ -479,6 +890,11 @@ async def get_drones_in_hex(
             db.add(hex_cell)
             await db.commit()
             await db.refresh(hex_cell)
+            # Ingest resolves cells from the in-memory index, here and in the other workers
+            add_hex_cells([[hex_cell.h3_index, hex_cell.id, hex_cell.center_lat, hex_cell.center_lng]])
+            airspace_events.publish_event("hex_cells", [
+                hex_cell.h3_index, hex_cell.id, hex_cell.center_lat, hex_cell.center_lng
+            ])
 
         # Get all drones in this hex cell
         drones = await db.execute(
@@ -501,13 +917,35 @@ async def get_drones_in_hex(
         )
 
 
-@router.get("/telemetry/{drone_id}", response_model=List[TelemetryDataSchema])
+@router.get(
+    "/telemetry/{drone_id}",
+    response_model=List[Union[TelemetryDataSchema, TelemetryRollupSchema]],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
 async def get_drone_telemetry(
         drone_id: int,
+        response: Response,
         hours: int = 1,
+        max_points: Optional[int] = Query(None, gt=0, description="Point budget; selects the finest resolution that fits"),
+        limit: Optional[int] = Query(None, gt=0, le=10000, description="Page size, defaults to 1000 (unbounded for NDJSON)"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+        format: str = Query("json", pattern="^(json|ndjson)$"),
         db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_active_user)
 ):
+    """
+    Telemetry history for a drone over the last `hours`, newest first.
+
+    Without max_points raw samples are returned. With it, the finest of raw (at most
+    one sample per second), 10 s or 1 min rollups whose bucket count fits the budget
+    is used, falling back to the coarsest. The resolution in seconds is reported in
+    the X-Telemetry-Resolution header (0 = raw). Rollups lag by up to the rollup lag
+    plus interval, so the newest buckets may be missing.
+
+    JSON responses are pages of `limit` rows; when more rows remain, X-Next-Cursor
+    holds the cursor for the next page. format=ndjson streams one row per line from
+    a server-side cursor instead of building the whole array in memory.
+    """
     # Check drone access
     drone_result = await db.execute(select(Drone).filter(Drone.id == drone_id))
     drone = drone_result.scalar_one_or_none()
@@ -523,18 +961,143 @@ async def get_drone_telemetry(
             detail="Not enough permissions"
         )
 
-    # Get telemetry data
+    window_seconds = hours * 3600
+    resolution = 0
+    if max_points is not None and window_seconds > max_points:
+        resolution = next(
+            (r for r in ROLLUP_RESOLUTIONS if window_seconds / r <= max_points),
+            ROLLUP_RESOLUTIONS[-1]
+        )
+
+    # The timestamp bound limits the scan to the matching partitions
     since_time = datetime.utcnow() - timedelta(hours=hours)
-    result = await db.execute(
-        select(TelemetryData)
-        .filter(and_(
-            TelemetryData.drone_id == drone_id,
-            TelemetryData.timestamp > since_time
-        ))
-        .order_by(desc(TelemetryData.timestamp))
+    streaming = format == "ndjson"
+    page_size = limit or (None if streaming else 1000)
+    try:
+        # Fetch one extra row to know whether another page follows
+        query = telemetry_history_query(
+            drone_id, since_time, resolution, cursor, page_size + 1 if page_size and not streaming else page_size
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if streaming:
+        return StreamingResponse(
+            stream_history_ndjson(query),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"X-Telemetry-Resolution": str(resolution)}
+        )
+
+    rows = (await db.execute(query)).scalars().all()
+    response.headers["X-Telemetry-Resolution"] = str(resolution)
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers["X-Next-Cursor"] = history_cursor(rows[-1])
+
+    return [history_schema(row) for row in rows]
+
+
+@router.get(
+    "/export/telemetry",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_FORMATS.values()}}}
+)
+async def export_telemetry(
+    drone_ids: str = Query(..., description="Comma-separated list of drone ids"),
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Admin export of raw telemetry for offline analysis, streamed as an Arrow IPC
+    stream or a Parquet file built chunk by chunk from a server-side cursor.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    try:
+        drone_id_list = [int(drone_id) for drone_id in drone_ids.split(",") if drone_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="drone_ids must be integers")
+    if not drone_id_list or end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one drone id and a non-empty time range are required"
+        )
+
+    extension = "arrows" if format == "arrow" else "parquet"
+    return StreamingResponse(
+        stream_telemetry_export(drone_id_list, start, end, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="telemetry_{start:%Y%m%dT%H%M%S}_{end:%Y%m%dT%H%M%S}.{extension}"'}
     )
 
-    return result.scalars().all()
+
+@router.get("/track/{drone_id}", response_model=DroneTrack)
+async def get_drone_track(
+    drone_id: int,
+    flight_request_id: Optional[int] = None,
+    hours: int = 1,
+    zoom: Optional[float] = Query(None, ge=0, le=24, description="Map zoom level the track is drawn at"),
+    max_points: Optional[int] = Query(None, ge=2, le=100000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Simplified track polyline for replay. With flight_request_id the whole flight is
+    returned, otherwise the last `hours`. Points are dropped with Douglas-Peucker at
+    a tolerance of half a pixel at `zoom` and/or capped at `max_points` (1000 if
+    neither is given). Retained points keep their original timestamps.
+    """
+    drone_result = await db.execute(select(Drone).filter(Drone.id == drone_id))
+    drone = drone_result.scalar_one_or_none()
+    if not drone:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Drone not found"
+        )
+
+    if drone.owner_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    query = select(
+        TelemetryData.timestamp, TelemetryData.latitude, TelemetryData.longitude, TelemetryData.altitude
+    ).filter(TelemetryData.drone_id == drone_id)
+    if flight_request_id is not None:
+        query = query.filter(TelemetryData.flight_request_id == flight_request_id)
+    else:
+        query = query.filter(TelemetryData.timestamp > datetime.utcnow() - timedelta(hours=hours))
+    rows = (await db.execute(query.order_by(TelemetryData.timestamp))).all()
+
+    if not rows:
+        return DroneTrack(drone_id=drone_id, flight_request_id=flight_request_id, tolerance_m=0.0, total_points=0)
+
+    timestamps, latitudes, longitudes, altitudes = zip(*rows)
+    latitudes = np.array(latitudes)
+    longitudes = np.array(longitudes)
+
+    tolerance_m = 0.0
+    if zoom is not None:
+        tolerance_m = meters_per_pixel(zoom, float(latitudes.mean())) / 2
+    elif max_points is None:
+        max_points = 1000
+
+    kept = simplify_track(latitudes, longitudes, tolerance_m=tolerance_m, max_points=max_points)
+    return DroneTrack(
+        drone_id=drone_id,
+        flight_request_id=flight_request_id,
+        tolerance_m=tolerance_m,
+        total_points=len(rows),
+        timestamps=[timestamps[i] for i in kept],
+        coordinates=[[longitudes[i], latitudes[i], altitudes[i]] for i in kept]
+    )
 
 
 @router.get("/alerts/", response_model=List[AlertSchema])
@@ -601,7 +1164,7 @@ async def resolve_alert(
     await db.refresh(alert)
 
     # Broadcast alert resolution
-    await manager.broadcast({
+    broadcast_all_workers({
         "type": "alert_resolved",
         "data": {
             "alert_id": alert.id,
@@ -645,101 +1208,32 @@ async def get_drones_at_location(
         )
 
 
-async def process_telemetry_data(
-    telemetry: TelemetryDataCreate,
-    db: AsyncSession
-) -> TelemetryData:
+async def process_telemetry_data(telemetry: TelemetryDataCreate):
     """Process incoming telemetry data and update current position"""
+    start = time.perf_counter()
     try:
-        # Create telemetry record
-        db_telemetry = TelemetryData(**telemetry.model_dump())
-        db.add(db_telemetry)
-
-        # Get hex cell for current position
-        h3_index = h3.geo_to_h3(telemetry.latitude, telemetry.longitude, 8)
-        hex_cell = await db.execute(
-            select(HexGridCell).where(HexGridCell.h3_index == h3_index)
-        )
-        hex_cell = hex_cell.scalar_one_or_none()
-
-        if not hex_cell:
-            logger.warning(f"No hex cell found for H3 index {h3_index}. Position may be outside Kazakhstan.")
-            # Still create telemetry record but skip position update
-            await db.commit()
-            await db.refresh(db_telemetry)
-            return db_telemetry
-
-
-        # Update or create current position
-        current_pos = await db.execute(
-            select(CurrentDronePosition)
-            .where(CurrentDronePosition.drone_id == telemetry.drone_id)
+        result = await ingest_queue.ingest([telemetry])
+    except IngestOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Telemetry ingest is overloaded, retry later",
+            headers={"Retry-After": str(e.retry_after)}
         )
-        current_pos = current_pos.scalar_one_or_none()
 
-        # Get old hex cell if drone is moving from one hex to another
-        old_hex_cell = None
-        if current_pos and current_pos.hex_cell_id != hex_cell.id:
-            old_hex_cell = await db.execute(
-                select(HexGridCell).where(HexGridCell.id == current_pos.hex_cell_id)
-            )
-            old_hex_cell = old_hex_cell.scalar_one_or_none()
-
-        if current_pos:
-            # Update existing position
-            current_pos.hex_cell_id = hex_cell.id
-            current_pos.latitude = telemetry.latitude
-            current_pos.longitude = telemetry.longitude
-            current_pos.altitude = telemetry.altitude
-            current_pos.speed = telemetry.speed
-            current_pos.heading = telemetry.heading
-            current_pos.battery_level = telemetry.battery_level
-            current_pos.status = telemetry.status
-            current_pos.flight_request_id = telemetry.flight_request_id
-        else:
-            # Create new position
-            current_pos = CurrentDronePosition(
-                drone_id=telemetry.drone_id,
-                flight_request_id=telemetry.flight_request_id,
-                hex_cell_id=hex_cell.id,
-                latitude=telemetry.latitude,
-                longitude=telemetry.longitude,
-                altitude=telemetry.altitude,
-                speed=telemetry.speed,
-                heading=telemetry.heading,
-                battery_level=telemetry.battery_level,
-                status=telemetry.status
-            )
-            db.add(current_pos)
-            # Increment drone count for new hex cell
-            if hex_cell.drones_count:
-                hex_cell.drones_count += 1
-            else:
-                hex_cell.drones_count = 1
-
-        # Update drone counts if drone moved between hex cells
-        if old_hex_cell:
-            if old_hex_cell.drones_count:
-                old_hex_cell.drones_count-= 1
-            else:
-                old_hex_cell.drones_count = 0
-
-            if hex_cell.drones_count:
-                hex_cell.drones_count += 1
-            else:
-                hex_cell.drones_count = 1
-        
-        await db.commit()
-        await db.refresh(db_telemetry)
-        return db_telemetry
-        
-    except Exception as e:
-        logger.error(f"Error processing telemetry data: {str(e)}", exc_info=True)
+    item = result.results[0]
+    if not item.accepted:
+        metrics.telemetry_errors += 1
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error processing telemetry data"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if item.retryable else status.HTTP_400_BAD_REQUEST,
+            detail=item.error
         )
 
+    metrics.telemetry_processed += 1
+    metrics.record_processing_time((time.perf_counter() - start) * 1000)
+    # id is 0 when history is written later by the write-behind buffer, skipped by the
+    # dead band, or the sample was coalesced
+    return TelemetryDataSchema(id=item.telemetry_id or 0, **telemetry.model_dump())
+
 
 @router.get("/zone/drones", response_model=List[ZoneDroneCount])
 async def get_zone_drones(
@@ -802,12 +1296,240 @@ async def get_zone_drones(
     return zone_counts
 
 
-@router.post("/telemetry/process", response_model=TelemetryDataSchema)
-async def process_telemetry(
-    telemetry: TelemetryDataCreate,
-    db: AsyncSession = Depends(get_db)
-):
-    return await process_telemetry_data(telemetry, db)
+# Request bodies for the ingest endpoints, which accept JSON or binary telemetry records
+def telemetry_request_body(json_schema: dict) -> dict:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": json_schema},
+                BINARY_CONTENT_TYPE: {
+                    "schema": {
+                        "type": "string",
+                        "format": "binary",
+                        "description": f"Concatenated {TELEMETRY_RECORD_SIZE}-byte records, see monitoring/wire_format.py"
+                    }
+                }
+            }
+        }
+    }
+
+
+async def read_telemetry_body(request: Request, batch: bool) -> List[Any]:
+    """
+    Decode an ingest request body as JSON or binary telemetry records,
+    depending on its Content-Type. Single-sample bodies are validated here,
+    batch items are validated individually by the ingest pipeline.
+    """
+    body = await request.body()
+    start = time.perf_counter()
+
+    if is_binary_content_type(request.headers.get("content-type", "")):
+        try:
+            samples = decode_telemetry_records(body)
+        except WireFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        wire_format = "binary"
+    elif batch:
+        try:
+            samples = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        if not isinstance(samples, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of samples")
+        wire_format = "json"
+    else:
+        try:
+            samples = [TelemetryDataCreate.model_validate_json(body)]
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        wire_format = "json"
+
+    metrics.record_decode(wire_format, len(samples), (time.perf_counter() - start) * 1000)
+    return samples
+
+
+@router.post(
+    "/telemetry/process",
+    response_model=TelemetryDataSchema,
+    openapi_extra=telemetry_request_body(TelemetryDataCreate.model_json_schema())
+)
+async def process_telemetry(request: Request):
+    samples = await read_telemetry_body(request, batch=False)
+    if len(samples) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Expected exactly one telemetry record, got {len(samples)}"
+        )
+    return await process_telemetry_data(samples[0])
+
+
+@router.post(
+    "/telemetry/batch",
+    response_model=TelemetryBatchResult,
+    openapi_extra=telemetry_request_body({"type": "array", "items": TelemetryDataCreate.model_json_schema()})
+)
+async def process_telemetry_batch(request: Request):
+    """
+    Ingest an array of telemetry samples through the bounded ingest queue.
+    The response reports accept/reject status per sample so gateways can retry only the failures;
+    rejects marked retryable were shed under load. 429 with Retry-After means nothing was queued.
+    """
+    samples = await read_telemetry_body(request, batch=True)
+    if len(samples) > settings.telemetry_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds maximum of {settings.telemetry_batch_max_size} samples"
+        )
+
+    start = time.perf_counter()
+    try:
+        result = await ingest_queue.ingest(samples)
+    except IngestOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Telemetry ingest is overloaded, retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    metrics.telemetry_processed += result.accepted
+    metrics.telemetry_errors += result.rejected
+    metrics.record_processing_time((time.perf_counter() - start) * 1000)
+    return result
+
+
+async def ingest_frame_samples(seq: Optional[int], samples: List[Any]) -> dict:
+    """Run one ingest channel frame through the batch pipeline and build its ack"""
+    if len(samples) > settings.telemetry_batch_max_size:
+        return {
+            "type": "error",
+            "seq": seq,
+            "detail": f"Frame exceeds maximum of {settings.telemetry_batch_max_size} samples"
+        }
+
+    start = time.perf_counter()
+    try:
+        result = await ingest_queue.ingest(samples)
+    except IngestOverloaded as e:
+        return {"type": "error", "seq": seq, "detail": "Telemetry ingest is overloaded", "retry_after": e.retry_after}
+
+    metrics.telemetry_processed += result.accepted
+    metrics.telemetry_errors += result.rejected
+    metrics.record_processing_time((time.perf_counter() - start) * 1000)
+
+    return {
+        "type": "ack",
+        "seq": seq,
+        "accepted": result.accepted,
+        "rejected": [
+            {"index": item.index, "error": item.error, "retryable": item.retryable}
+            for item in result.results if not item.accepted
+        ]
+    }
+
+
+async def process_ingest_frame(frame: str) -> dict:
+    """Handle a JSON frame: {"seq": <int>, "data": <sample> | [<sample>, ...]}"""
+    start = time.perf_counter()
+    try:
+        message = json.loads(frame)
+        seq = message.get("seq")
+        data = message["data"]
+    except (ValueError, KeyError, AttributeError, TypeError):
+        return {"type": "error", "seq": None, "detail": "Malformed frame, expected {\"seq\": ..., \"data\": ...}"}
+
+    samples = data if isinstance(data, list) else [data]
+    metrics.record_decode("json", len(samples), (time.perf_counter() - start) * 1000)
+    return await ingest_frame_samples(seq, samples)
+
+
+async def process_binary_ingest_frame(frame: bytes) -> dict:
+    """Handle a binary frame: uint32 little-endian seq followed by binary telemetry records"""
+    start = time.perf_counter()
+    if len(frame) < 4:
+        return {"type": "error", "seq": None, "detail": "Binary frame is missing its sequence number"}
+
+    seq = int.from_bytes(frame[:4], "little")
+    try:
+        samples = decode_telemetry_records(frame[4:])
+    except WireFormatError as e:
+        return {"type": "error", "seq": seq, "detail": str(e)}
+
+    metrics.record_decode("binary", len(samples), (time.perf_counter() - start) * 1000)
+    return await ingest_frame_samples(seq, samples)
+
+
+@router.websocket("/ingest/ws")
+async def telemetry_ingest_websocket(websocket: WebSocket):
+    """
+    Persistent telemetry ingest channel for drones and gateways.
+
+    The client authenticates once with a bearer token (Authorization header or
+    ?token= query parameter), then streams frames without waiting for replies:
+    text frames of the form {"seq": <int>, "data": <sample> | [<sample>, ...]},
+    or binary frames holding a uint32 seq followed by binary telemetry records.
+    Each frame goes through the same pipeline as the batch endpoint and is
+    answered with an ack carrying its seq and any rejected samples.
+
+    Up to ingest_ws_max_in_flight_frames frames are processed concurrently, so
+    the ingest queue can batch frames of one connection into shared
+    transactions; acks therefore come back in completion order, not seq order.
+    With the window full the socket isn't read until a frame completes.
+    """
+    token = websocket.query_params.get("token")
+    authorization = websocket.headers.get("authorization")
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+
+    user = None
+    if token:
+        async with AsyncSessionLocal() as db:
+            user = await get_user_from_token(token, db)
+
+    if user is None or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    metrics.ingest_connections += 1
+    logger.info(f"Telemetry ingest channel opened by {user.email}")
+    in_flight = asyncio.Semaphore(settings.ingest_ws_max_in_flight_frames)
+    send_lock = asyncio.Lock()
+    frames: Set[asyncio.Task] = set()
+
+    async def handle_frame(message: dict):
+        try:
+            if message.get("bytes") is not None:
+                ack = await process_binary_ingest_frame(message["bytes"])
+            else:
+                ack = await process_ingest_frame(message["text"])
+            async with send_lock:
+                await websocket.send_text(json.dumps(ack))
+        except Exception as e:
+            logger.error(f"Telemetry ingest frame error: {e}", exc_info=True)
+        finally:
+            in_flight.release()
+
+    try:
+        while True:
+            await in_flight.acquire()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            frame = asyncio.create_task(handle_frame(message))
+            frames.add(frame)
+            frame.add_done_callback(frames.discard)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Telemetry ingest channel error: {e}", exc_info=True)
+    finally:
+        # Samples already queued are still stored, only their acks are lost
+        for frame in frames:
+            frame.cancel()
+        metrics.ingest_connections -= 1
+        logger.info(f"Telemetry ingest channel closed by {user.email}")
 
 
 @router.get("/all-hex")
@@ -18,7 +18,7 @@ class TelemetryDataBase(BaseModel):
 
 
 class TelemetryDataCreate(TelemetryDataBase):
-    pass
+    timestamp: Optional[datetime] = None  # Device time; server receive time when omitted
 
 
 class TelemetryData(TelemetryDataBase):
@@ -29,6 +29,52 @@ class TelemetryData(TelemetryDataBase):
         from_attributes = True
 
 
+class TelemetryRollup(BaseModel):
+    drone_id: int
+    resolution_seconds: int
+    bucket_start: datetime
+    sample_count: int
+    mean_latitude: float
+    mean_longitude: float
+    last_latitude: float
+    last_longitude: float
+    min_altitude: float
+    max_altitude: float
+    mean_speed: Optional[float] = None
+    min_battery_level: Optional[float] = None
+    last_status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DroneTrack(BaseModel):
+    drone_id: int
+    flight_request_id: Optional[int] = None
+    tolerance_m: float
+    total_points: int  # Points in the raw track before simplification
+    # Parallel arrays, one entry per retained point in time order
+    timestamps: List[datetime] = []
+    coordinates: List[List[float]] = []  # [longitude, latitude, altitude]
+
+
+class TelemetryBatchItemResult(BaseModel):
+    index: int  # Position of the sample in the submitted batch
+    accepted: bool
+    telemetry_id: Optional[int] = None
+    position_updated: bool = False
+    stored: bool = False  # Written to telemetry history (False when inside the dead band)
+    coalesced: bool = False  # Superseded by a newer sample for the same drone while queued
+    retryable: bool = False  # Rejected for a transient reason (overload, processing error)
+    error: Optional[str] = None
+
+
+class TelemetryBatchResult(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[TelemetryBatchItemResult] = []
+
+
 class AlertBase(BaseModel):
     drone_id: int
     flight_request_id: Optional[int] = None
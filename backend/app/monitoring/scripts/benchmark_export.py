@@ -0,0 +1,101 @@
+# app/monitoring/scripts/benchmark_export.py
+"""
+Compare payload size and wall time of the telemetry history endpoint (paged JSON
+and NDJSON) against the columnar export (Arrow IPC and Parquet) for the same
+drone and time window.
+
+    python -m app.monitoring.scripts.benchmark_export --token <admin token> --drone-id 1 --hours 24
+"""
+import argparse
+import io
+import time
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+
+def fetch_json_pages(session: requests.Session, url: str, drone_id: int, hours: int, page_size: int):
+    rows = 0
+    size = 0
+    cursor = None
+    while True:
+        params = {"hours": hours, "limit": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        response = session.get(f"{url}/monitoring/telemetry/{drone_id}", params=params)
+        response.raise_for_status()
+        size += len(response.content)
+        rows += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows, size
+
+
+def fetch_ndjson(session: requests.Session, url: str, drone_id: int, hours: int):
+    rows = 0
+    size = 0
+    with session.get(
+        f"{url}/monitoring/telemetry/{drone_id}",
+        params={"hours": hours, "format": "ndjson"},
+        stream=True
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            size += len(line) + 1
+            rows += 1 if line else 0
+    return rows, size
+
+
+def fetch_export(session: requests.Session, url: str, drone_id: int, hours: int, export_format: str):
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=hours)
+    response = session.get(f"{url}/monitoring/export/telemetry", params={
+        "drone_ids": str(drone_id),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "format": export_format
+    })
+    response.raise_for_status()
+    if export_format == "parquet":
+        table = pq.read_table(io.BytesIO(response.content))
+    else:
+        table = pa.ipc.open_stream(response.content).read_all()
+    return table.num_rows, len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry export vs JSON history benchmark")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the UTM API")
+    parser.add_argument("--token", required=True, help="Admin authentication token")
+    parser.add_argument("--drone-id", type=int, default=1, help="Drone to read history for")
+    parser.add_argument("--hours", type=int, default=24, help="Window length in hours")
+    parser.add_argument("--page-size", type=int, default=10000, help="Page size for the JSON endpoint")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {args.token}"
+
+    runs = [
+        ("json (paged)", lambda: fetch_json_pages(session, args.url, args.drone_id, args.hours, args.page_size)),
+        ("ndjson", lambda: fetch_ndjson(session, args.url, args.drone_id, args.hours)),
+        ("arrow", lambda: fetch_export(session, args.url, args.drone_id, args.hours, "arrow")),
+        ("parquet", lambda: fetch_export(session, args.url, args.drone_id, args.hours, "parquet")),
+    ]
+
+    print(f"{'format':<14}{'rows':>10}{'bytes':>14}{'bytes/row':>11}{'seconds':>10}")
+    baseline = None
+    for name, run in runs:
+        start = time.perf_counter()
+        rows, size = run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or (size, elapsed)
+        print(
+            f"{name:<14}{rows:>10}{size:>14}{size / rows if rows else 0:>11.1f}{elapsed:>10.2f}"
+            f"   ({baseline[0] / size if size else 0:.1f}x smaller, {baseline[1] / elapsed if elapsed else 0:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# app/monitoring/scripts/benchmark_ingest.py
+"""
+Compare telemetry ingest throughput of single-sample HTTP POSTs (with a number
+of concurrent requests) against the ingest WebSocket channel, one sample per
+frame on a single connection, for the same number of samples.
+
+    python -m app.monitoring.scripts.benchmark_ingest --token <token> --drone-ids 1,2,3 --samples 5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+import httpx
+import websockets
+
+
+def make_sample(drone_ids, index: int) -> dict:
+    return {
+        "drone_id": drone_ids[index % len(drone_ids)],
+        "latitude": 43.238 + random.uniform(-0.05, 0.05),
+        "longitude": 76.945 + random.uniform(-0.05, 0.05),
+        "altitude": random.uniform(50, 120),
+        "speed": 10.0,
+        "heading": random.uniform(0, 360),
+        "battery_level": 80.0,
+        "status": "airborne",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+async def run_http(url: str, headers: dict, drone_ids, samples: int, concurrency: int):
+    next_index = iter(range(samples))
+    accepted = 0
+
+    async def client(session: httpx.AsyncClient):
+        nonlocal accepted
+        for index in next_index:
+            response = await session.post(f"{url}/monitoring/telemetry/process", json=make_sample(drone_ids, index))
+            accepted += response.status_code == 200
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=60) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return accepted
+
+
+async def run_ws(url: str, headers: dict, drone_ids, samples: int):
+    accepted = 0
+    async with websockets.connect(
+            f"{url.replace('http', 'ws', 1)}/monitoring/ingest/ws", extra_headers=headers
+    ) as ws:
+        async def read_acks():
+            nonlocal accepted
+            acks = 0
+            async for message in ws:
+                ack = json.loads(message)
+                if ack.get("type") == "ack":
+                    accepted += ack["accepted"]
+                acks += 1
+                if acks == samples:
+                    return
+
+        reader = asyncio.create_task(read_acks())
+        for index in range(samples):
+            await ws.send(json.dumps({"seq": index + 1, "data": make_sample(drone_ids, index)}))
+        await reader
+    return accepted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="HTTP vs WebSocket telemetry ingest benchmark")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the UTM API")
+    parser.add_argument("--token", required=True, help="Authentication token")
+    parser.add_argument("--drone-ids", default="1", help="Comma separated ids of registered drones")
+    parser.add_argument("--samples", type=int, default=5000, help="Samples sent per transport")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent HTTP requests")
+    args = parser.parse_args()
+
+    drone_ids = [int(drone_id) for drone_id in args.drone_ids.split(",")]
+    headers = {"Authorization": f"Bearer {args.token}"}
+    runs = [
+        (f"http x{args.concurrency}", lambda: run_http(args.url, headers, drone_ids, args.samples, args.concurrency)),
+        ("websocket", lambda: run_ws(args.url, headers, drone_ids, args.samples)),
+    ]
+
+    print(f"{'transport':<14}{'samples':>10}{'accepted':>10}{'seconds':>10}{'samples/s':>12}")
+    for name, run in runs:
+        start = time.perf_counter()
+        accepted = await run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<14}{args.samples:>10}{accepted:>10}{elapsed:>10.2f}{args.samples / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
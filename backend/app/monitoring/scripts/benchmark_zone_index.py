@@ -0,0 +1,104 @@
+# app/monitoring/scripts/benchmark_zone_index.py
+"""
+Compare restricted zone lookups through the H3 zone index against the linear
+scan over every zone, on random zones and points around a city center. The
+scan is timed on a sample of the points (it is quadratic) and both paths are
+checked to return the same zones for that sample.
+
+    python -m app.monitoring.scripts.benchmark_zone_index --zones 10000 --points 10000
+"""
+import argparse
+import random
+import time
+
+from app.flights.models import RestrictedZone
+from app.monitoring.zones import ZoneIndex
+from app.utils.geospatial import calculate_distance
+
+
+def random_zones(count: int, center_lat: float, center_lng: float, spread: float,
+                 min_radius: float, max_radius: float):
+    return [
+        RestrictedZone(
+            id=zone_id,
+            name=f"Zone {zone_id}",
+            center_lat=center_lat + random.uniform(-spread, spread),
+            center_lng=center_lng + random.uniform(-spread, spread),
+            radius=random.uniform(min_radius, max_radius),
+            max_altitude=120.0,
+            is_active=True
+        )
+        for zone_id in range(1, count + 1)
+    ]
+
+
+def linear_scan(zones, latitude: float, longitude: float):
+    return [
+        zone for zone in zones
+        if calculate_distance(latitude, longitude, zone.center_lat, zone.center_lng) <= zone.radius
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Restricted zone index vs linear scan benchmark")
+    parser.add_argument("--zones", type=int, default=10000, help="Number of random zones")
+    parser.add_argument("--points", type=int, default=10000, help="Number of random points to look up")
+    parser.add_argument("--scan-points", type=int, default=100, help="Points to time the linear scan on")
+    parser.add_argument("--lat", type=float, default=43.238, help="Latitude of the area center")
+    parser.add_argument("--lng", type=float, default=76.945, help="Longitude of the area center")
+    parser.add_argument("--spread", type=float, default=0.5, help="Half width of the area in degrees")
+    parser.add_argument("--min-radius", type=float, default=100.0, help="Smallest zone radius in meters")
+    parser.add_argument("--max-radius", type=float, default=2000.0, help="Largest zone radius in meters")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    zones = random_zones(args.zones, args.lat, args.lng, args.spread, args.min_radius, args.max_radius)
+    points = [
+        (args.lat + random.uniform(-args.spread, args.spread), args.lng + random.uniform(-args.spread, args.spread))
+        for _ in range(args.points)
+    ]
+
+    start = time.perf_counter()
+    index = ZoneIndex(zones)
+    build_seconds = time.perf_counter() - start
+    stats = index.get_stats()
+    print(
+        f"index: {stats['zones']} zones, {stats['indexed_cells']} cells at resolutions {stats['resolutions']}, "
+        f"built in {build_seconds:.2f}s"
+    )
+
+    start = time.perf_counter()
+    candidates = sum(len(index.candidates(lat, lng)) for lat, lng in points)
+    candidates_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    hits = sum(len(index.containing(lat, lng)) for lat, lng in points)
+    indexed_seconds = time.perf_counter() - start
+
+    sample = points[:args.scan_points]
+    start = time.perf_counter()
+    scanned = [linear_scan(zones, lat, lng) for lat, lng in sample]
+    scan_seconds = time.perf_counter() - start
+    mismatches = sum(
+        {zone.id for zone in expected} != {zone.id for zone in index.containing(lat, lng)}
+        for (lat, lng), expected in zip(sample, scanned)
+    )
+
+    indexed_us = indexed_seconds / len(points) * 1e6
+    scan_us = scan_seconds / len(sample) * 1e6
+    print(f"{'lookup':<14}{'points':>10}{'us/point':>12}{'total s':>12}")
+    print(f"{'bbox filter':<14}{len(points):>10}{candidates_seconds / len(points) * 1e6:>12.1f}{candidates_seconds:>12.2f}")
+    print(f"{'indexed':<14}{len(points):>10}{indexed_us:>12.1f}{indexed_seconds:>12.2f}")
+    print(
+        f"{'linear scan':<14}{len(sample):>10}{scan_us:>12.1f}{scan_us * len(points) / 1e6:>12.2f}"
+        f"   (extrapolated to {len(points)} points)"
+    )
+    print(
+        f"{candidates / len(points):.2f} candidates and {hits / len(points):.2f} zones per point, "
+        f"{scan_us / indexed_us if indexed_us else 0:.0f}x faster, "
+        f"{mismatches} mismatches over {len(sample)} scanned points"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import AsyncSessionLocal
 from app.monitoring.models import HexGridCell
+from app.monitoring.hex_index import hex_index
+from app.monitoring.notify import airspace_events
 from geoalchemy2.shape import from_shape
 from fastapi import APIRouter
 
@@ -15,6 +17,11 @@ NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 
 @router.get("/populate-hex-grid")
 async def populate_hex_grid():
+    """
+    Fill hex_grid_cells for Astana once. The worker serving the request reloads its
+    hex index right away and tells the other workers to reload theirs over the
+    airspace event channel; with the channel disabled they need a restart.
+    """
     async with AsyncSessionLocal() as db:
         existing = (await db.execute(select(HexGridCell))).scalars().all()
         if existing:
@@ -77,3 +84,15 @@ async def populate_hex_grid():
             print(f"Inserted {len(cells)} hex cells")
 
         print("Finished populating hex grid")
+
+    # Pick up the new cells in the ingest lookup table, here and in the other workers
+    await hex_index.load()
+    airspace_events.publish_event("hex_index_reload")
+
+
+def reload_hex_index(items: list):
+    """Another worker populated the grid; reload this worker's lookup table"""
+    hex_index.reload_in_background()
+
+
+airspace_events.subscribe("hex_index_reload", reload_hex_index)
@@ -0,0 +1,209 @@
+# app/monitoring/viewports.py
+import math
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+import h3
+
+# A bbox is indexed under cells of the finest resolution that keeps its cover
+# around this many cells, candidates are then checked against the bbox exactly
+MAX_BBOX_COVER_CELLS = 200
+MAX_BBOX_COVER_RESOLUTION = 9
+# Widest bbox slice handed to h3.polyfill at once
+MAX_POLYFILL_WIDTH_DEGREES = 90
+KM_PER_DEGREE = 111.32
+
+# min_lng, min_lat, max_lng, max_lat (GeoJSON bbox order)
+BBox = Tuple[float, float, float, float]
+
+
+class InvalidSubscription(ValueError):
+    pass
+
+
+def parse_bbox(value) -> BBox:
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        raise InvalidSubscription("bbox must be [min_lng, min_lat, max_lng, max_lat]")
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise InvalidSubscription("bbox values must be numbers")
+    if not (-180 <= min_lng <= max_lng <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise InvalidSubscription("bbox must satisfy -180 <= min_lng <= max_lng <= 180 and -90 <= min_lat <= max_lat <= 90")
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_cells(value) -> Set[str]:
+    if not isinstance(value, (list, tuple)):
+        raise InvalidSubscription("h3_cells must be a list of H3 indexes")
+    invalid = [cell for cell in value if not isinstance(cell, str) or not h3.h3_is_valid(cell)]
+    if invalid:
+        raise InvalidSubscription(f"Invalid H3 cells: {invalid[:5]}")
+    return set(value)
+
+
+def _lng_scale(latitude: float) -> float:
+    """Length of a degree of longitude at a latitude, relative to the equator"""
+    return max(math.cos(math.radians(latitude)), 0.0)
+
+
+def bbox_cover(bbox: BBox, max_cells: int = MAX_BBOX_COVER_CELLS) -> Set[str]:
+    """H3 cells that together cover the whole bbox"""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    width_km = (max_lng - min_lng) * KM_PER_DEGREE * math.cos(math.radians((min_lat + max_lat) / 2))
+    area_km2 = max(width_km, 0.0) * (max_lat - min_lat) * KM_PER_DEGREE
+    height_km = (max_lat - min_lat) * KM_PER_DEGREE
+    perimeter_km = 2 * height_km + (max_lng - min_lng) * KM_PER_DEGREE * (
+        _lng_scale(min_lat) + _lng_scale(max_lat)
+    )
+
+    # Both the area and the edges (a long thin bbox) have to fit the budget
+    resolution = 0
+    for candidate in range(1, MAX_BBOX_COVER_RESOLUTION + 1):
+        if (area_km2 / h3.hex_area(candidate, unit="km^2") > max_cells
+                or perimeter_km / h3.edge_length(candidate, unit="km") > max_cells):
+            break
+        resolution = candidate
+    if resolution == 0:
+        # A continent-sized bbox is cheapest covered by the 122 base cells
+        return set(h3.get_res0_indexes())
+
+    # polyfill fails on polygons 180 degrees wide or more, so fill in slices
+    cells = set()
+    slices = max(1, math.ceil((max_lng - min_lng) / MAX_POLYFILL_WIDTH_DEGREES))
+    slice_width = (max_lng - min_lng) / slices
+    for i in range(slices):
+        west = min_lng + i * slice_width
+        east = max_lng if i == slices - 1 else west + slice_width
+        polygon = {
+            "type": "Polygon",
+            "coordinates": [[[west, min_lat], [east, min_lat], [east, max_lat], [west, max_lat], [west, min_lat]]]
+        }
+        cells.update(h3.polyfill(polygon, resolution, geo_json_conformant=True))
+
+    # polyfill only keeps cells whose center is inside; cells along the edges,
+    # sampled closer than a cell edge, plus the ring around every cell make sure
+    # the bbox edges are covered too
+    edge_km = h3.edge_length(resolution, unit="km")
+    for lat in (min_lat, max_lat):
+        lng_steps = max(1, math.ceil((max_lng - min_lng) * KM_PER_DEGREE * _lng_scale(lat) / edge_km))
+        for i in range(lng_steps + 1):
+            cells.add(h3.geo_to_h3(lat, min_lng + (max_lng - min_lng) * i / lng_steps, resolution))
+    lat_steps = max(1, math.ceil(height_km / edge_km))
+    for i in range(lat_steps + 1):
+        lat = min_lat + (max_lat - min_lat) * i / lat_steps
+        cells.add(h3.geo_to_h3(lat, min_lng, resolution))
+        cells.add(h3.geo_to_h3(lat, max_lng, resolution))
+    return set().union(*(h3.k_ring(cell, 1) for cell in cells))
+
+
+class Viewport:
+    """Region one viewer subscribed to: a union of bboxes and H3 cells of any resolution"""
+
+    def __init__(self):
+        self.bboxes: Dict[BBox, Set[str]] = {}  # bbox -> its cover cells
+        self.cells: Set[str] = set()
+
+    def index_cells(self) -> Set[str]:
+        return self.cells.union(*self.bboxes.values())
+
+    def contains(self, latitude: float, longitude: float, cell: str) -> bool:
+        """Exact test for a point whose cell (at some resolution) is indexed for this viewport"""
+        if cell in self.cells:
+            return True
+        return any(
+            cell in cover and min_lng <= longitude <= max_lng and min_lat <= latitude <= max_lat
+            for (min_lng, min_lat, max_lng, max_lat), cover in self.bboxes.items()
+        )
+
+
+class ViewportIndex:
+    """
+    Which viewers should see a drone at a given position.
+
+    Viewports are indexed by H3 cell, at whatever resolutions the subscriptions
+    use. Matching a position costs one geo_to_h3 and dict lookup per resolution
+    in use, plus exact checks for the few viewports indexed under those cells,
+    however many viewers and drones there are. Viewers without a viewport
+    aren't filtered and are not in the index.
+    """
+
+    def __init__(self):
+        self._viewports: Dict[Hashable, Viewport] = {}
+        self._subscribers: Dict[str, Set[Hashable]] = defaultdict(set)
+        # resolution -> number of (cell, viewer) entries, to know which resolutions to probe
+        self._resolutions: Dict[int, int] = defaultdict(int)
+
+    def _index(self, key: Hashable, cells: Iterable[str]):
+        for cell in cells:
+            self._subscribers[cell].add(key)
+            self._resolutions[h3.h3_get_resolution(cell)] += 1
+
+    def _unindex(self, key: Hashable, cells: Iterable[str]):
+        for cell in cells:
+            subscribers = self._subscribers.get(cell)
+            if subscribers is None or key not in subscribers:
+                continue
+            subscribers.discard(key)
+            if not subscribers:
+                del self._subscribers[cell]
+            resolution = h3.h3_get_resolution(cell)
+            self._resolutions[resolution] -= 1
+            if not self._resolutions[resolution]:
+                del self._resolutions[resolution]
+
+    def is_filtered(self, key: Hashable) -> bool:
+        return key in self._viewports
+
+    def subscribe(
+            self,
+            key: Hashable,
+            bbox: Optional[BBox] = None,
+            cells: Optional[Set[str]] = None,
+            replace: bool = False
+    ):
+        """Add a bbox and/or cells to the viewer's viewport, or replace the viewport with them"""
+        viewport = self._viewports.get(key)
+        if viewport is None or replace:
+            if viewport is not None:
+                self._unindex(key, viewport.index_cells())
+            viewport = self._viewports[key] = Viewport()
+        else:
+            self._unindex(key, viewport.index_cells())
+
+        if bbox is not None:
+            viewport.bboxes[bbox] = bbox_cover(bbox)
+        if cells:
+            viewport.cells |= cells
+        self._index(key, viewport.index_cells())
+
+    def unsubscribe(self, key: Hashable, bbox: Optional[BBox] = None, cells: Optional[Set[str]] = None):
+        """Remove a bbox and/or cells from the viewport; with neither, drop the viewport entirely"""
+        viewport = self._viewports.get(key)
+        if viewport is None:
+            return
+        self._unindex(key, viewport.index_cells())
+        if bbox is None and not cells:
+            del self._viewports[key]
+            return
+        viewport.bboxes.pop(bbox, None)
+        viewport.cells -= cells or set()
+        self._index(key, viewport.index_cells())
+
+    def remove(self, key: Hashable):
+        self.unsubscribe(key)
+
+    def match(self, latitude: float, longitude: float) -> Set[Hashable]:
+        matched = set()
+        for resolution in self._resolutions:
+            cell = h3.geo_to_h3(latitude, longitude, resolution)
+            for key in self._subscribers.get(cell, ()):
+                if key not in matched and self._viewports[key].contains(latitude, longitude, cell):
+                    matched.add(key)
+        return matched
+
+    def get_stats(self):
+        return {
+            "viewports": len(self._viewports),
+            "indexed_cells": len(self._subscribers),
+            "resolutions": sorted(self._resolutions)
+        }
@@ -0,0 +1,131 @@
+# app/monitoring/wire_format.py
+from datetime import datetime, timezone
+from typing import List, Sequence
+import numpy as np
+
+from .schemas import TelemetryDataBase, TelemetryDataCreate
+
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+# Status byte values, index in this tuple is the code on the wire
+TELEMETRY_STATUSES = ("airborne", "hovering", "landing", "landed", "emergency", "disconnected")
+_STATUS_CODES = {name: code for code, name in enumerate(TELEMETRY_STATUSES)}
+
+# Fixed 52-byte little-endian record, fields naturally aligned:
+#   drone_id           uint32
+#   flight_request_id  uint32   (0 = no flight request)
+#   latitude           float64
+#   longitude          float64
+#   altitude           float32  (m)
+#   speed              float32  (m/s)
+#   heading            float32  (degrees)
+#   battery_level      float32  (%)
+#   timestamp_ms       int64    (device time, ms since Unix epoch, 0 = unknown)
+#   status             uint8    (index into TELEMETRY_STATUSES)
+#   reserved           3 bytes
+TELEMETRY_RECORD_DTYPE = np.dtype([
+    ("drone_id", "<u4"),
+    ("flight_request_id", "<u4"),
+    ("latitude", "<f8"),
+    ("longitude", "<f8"),
+    ("altitude", "<f4"),
+    ("speed", "<f4"),
+    ("heading", "<f4"),
+    ("battery_level", "<f4"),
+    ("timestamp_ms", "<i8"),
+    ("status", "u1"),
+    ("reserved", "V3"),
+])
+TELEMETRY_RECORD_SIZE = TELEMETRY_RECORD_DTYPE.itemsize
+
+# Latest timestamp_ms a datetime can hold (9999-12-31T23:59:59.999Z)
+MAX_TIMESTAMP_MS = 253402300799999
+
+
+class WireFormatError(ValueError):
+    pass
+
+
+def is_binary_content_type(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() == BINARY_CONTENT_TYPE
+
+
+def decode_telemetry_records(payload: bytes) -> List[TelemetryDataCreate]:
+    """
+    Decode a buffer of concatenated binary telemetry records.
+
+    The whole batch is decoded with one structured-array view and per-column
+    conversions; samples are built with model_construct since every field is
+    already typed by the record layout.
+    """
+    if len(payload) % TELEMETRY_RECORD_SIZE:
+        raise WireFormatError(
+            f"Payload of {len(payload)} bytes is not a multiple of the {TELEMETRY_RECORD_SIZE}-byte record size"
+        )
+
+    records = np.frombuffer(payload, dtype=TELEMETRY_RECORD_DTYPE)
+    if len(records) and records["status"].max() >= len(TELEMETRY_STATUSES):
+        raise WireFormatError(f"Unknown status code {int(records['status'].max())}")
+
+    if len(records) and not ((records["timestamp_ms"] >= 0) & (records["timestamp_ms"] <= MAX_TIMESTAMP_MS)).all():
+        raise WireFormatError(f"timestamp_ms must be between 0 and {MAX_TIMESTAMP_MS}")
+
+    statuses = np.array(TELEMETRY_STATUSES, dtype=object)[records["status"]]
+    flight_request_ids = records["flight_request_id"].astype(object)
+    flight_request_ids[flight_request_ids == 0] = None
+    timestamps = [
+        datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc) if timestamp_ms else None
+        for timestamp_ms in records["timestamp_ms"].tolist()
+    ]
+
+    columns = zip(
+        records["drone_id"].tolist(),
+        flight_request_ids.tolist(),
+        records["latitude"].tolist(),
+        records["longitude"].tolist(),
+        records["altitude"].astype(np.float64).tolist(),
+        records["speed"].astype(np.float64).tolist(),
+        records["heading"].astype(np.float64).tolist(),
+        records["battery_level"].astype(np.float64).tolist(),
+        statuses.tolist(),
+        timestamps
+    )
+    return [
+        TelemetryDataCreate.model_construct(
+            drone_id=drone_id,
+            flight_request_id=flight_request_id,
+            latitude=latitude,
+            longitude=longitude,
+            altitude=altitude,
+            speed=speed,
+            heading=heading,
+            battery_level=battery_level,
+            status=status,
+            timestamp=timestamp
+        )
+        for drone_id, flight_request_id, latitude, longitude, altitude, speed, heading, battery_level, status, timestamp
+        in columns
+    ]
+
+
+def encode_telemetry_records(samples: Sequence[TelemetryDataBase]) -> bytes:
+    """Encode samples into the binary record layout"""
+    records = np.zeros(len(samples), dtype=TELEMETRY_RECORD_DTYPE)
+    for i, sample in enumerate(samples):
+        if sample.status not in _STATUS_CODES:
+            raise WireFormatError(f"Status {sample.status!r} has no wire code")
+        timestamp = getattr(sample, "timestamp", None)
+        records[i] = (
+            sample.drone_id,
+            sample.flight_request_id or 0,
+            sample.latitude,
+            sample.longitude,
+            sample.altitude,
+            sample.speed or 0.0,
+            sample.heading or 0.0,
+            sample.battery_level or 0.0,
+            int(timestamp.replace(tzinfo=timestamp.tzinfo or timezone.utc).timestamp() * 1000) if timestamp else 0,
+            _STATUS_CODES[sample.status],
+            b"\x00\x00\x00"
+        )
+    return records.tobytes()
@@ -0,0 +1,154 @@
+# app/monitoring/write_behind.py
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from ..config import settings
+from ..database import engine
+from .schemas import TelemetryDataCreate
+from ..utils.logger import setup_logger
+
+logger = setup_logger("utm.write_behind")
+
+TELEMETRY_COPY_COLUMNS = (
+    "drone_id", "flight_request_id", "latitude", "longitude", "altitude",
+    "speed", "heading", "battery_level", "status", "timestamp"
+)
+
+
+class TelemetryWriteBuffer:
+    """
+    Write-behind buffer for raw telemetry history.
+
+    Samples are queued in memory and written with asyncpg COPY by a background
+    task whenever flush_rows samples are pending or flush_interval_ms has passed,
+    whichever comes first. Current positions are still written synchronously by
+    the ingest path, so only history lags behind by up to one flush interval.
+    """
+
+    def __init__(self, flush_rows: int, flush_interval_ms: int, max_buffered_rows: int):
+        self.flush_rows = flush_rows
+        self.flush_interval_ms = flush_interval_ms
+        self.max_buffered_rows = max_buffered_rows
+        self._rows: List[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.is_running = False
+
+        self.rows_flushed = 0
+        self.rows_dropped = 0
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.flush_sizes = deque(maxlen=1000)
+        self.flush_latencies_ms = deque(maxlen=1000)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.telemetry_write_behind
+
+    def start(self):
+        """Start the background flush loop"""
+        logger.info(
+            f"Starting telemetry write-behind buffer "
+            f"(flush at {self.flush_rows} rows or {self.flush_interval_ms}ms)"
+        )
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and drain everything still buffered"""
+        logger.info(f"Stopping telemetry write-behind buffer, draining {len(self._rows)} rows")
+        self.is_running = False
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, samples: Iterable[TelemetryDataCreate]):
+        """Queue telemetry samples for the next flush"""
+        received_at = datetime.now(timezone.utc)
+        for sample in samples:
+            self._rows.append((
+                sample.drone_id,
+                sample.flight_request_id,
+                sample.latitude,
+                sample.longitude,
+                sample.altitude,
+                sample.speed,
+                sample.heading,
+                sample.battery_level,
+                sample.status,
+                sample.timestamp or received_at
+            ))
+
+        overflow = len(self._rows) - self.max_buffered_rows
+        if overflow > 0:
+            # Database can't keep up; shed the oldest history rather than grow without bound
+            del self._rows[:overflow]
+            self.rows_dropped += overflow
+            logger.warning(f"Telemetry write buffer full, dropped {overflow} oldest rows")
+
+        if len(self._rows) >= self.flush_rows:
+            self._wakeup.set()
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write all buffered rows in chunks of at most flush_rows"""
+        while self._rows:
+            rows = self._rows[:self.flush_rows]
+            del self._rows[:self.flush_rows]
+
+            start = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    raw_connection = await conn.get_raw_connection()
+                    await raw_connection.driver_connection.copy_records_to_table(
+                        "telemetry_data",
+                        records=rows,
+                        columns=TELEMETRY_COPY_COLUMNS
+                    )
+            except Exception as e:
+                self.flush_errors += 1
+                logger.error(f"Error flushing {len(rows)} telemetry rows: {str(e)}", exc_info=True)
+                # Put the rows back for the next attempt, within the buffer limit
+                room = max(self.max_buffered_rows - len(self._rows), 0)
+                self._rows[:0] = rows[-room:] if room else []
+                self.rows_dropped += len(rows) - min(room, len(rows))
+                return
+
+            self.flush_count += 1
+            self.rows_flushed += len(rows)
+            self.flush_sizes.append(len(rows))
+            self.flush_latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "buffer_depth": len(self._rows),
+            "rows_flushed": self.rows_flushed,
+            "rows_dropped": self.rows_dropped,
+            "flush_count": self.flush_count,
+            "flush_errors": self.flush_errors,
+            "avg_flush_size": sum(self.flush_sizes) / len(self.flush_sizes) if self.flush_sizes else 0,
+            "max_flush_size": max(self.flush_sizes) if self.flush_sizes else 0,
+            "avg_flush_latency_ms": sum(self.flush_latencies_ms) / len(self.flush_latencies_ms) if self.flush_latencies_ms else 0,
+            "max_flush_latency_ms": max(self.flush_latencies_ms) if self.flush_latencies_ms else 0
+        }
+
+
+telemetry_buffer = TelemetryWriteBuffer(
+    flush_rows=settings.telemetry_flush_rows,
+    flush_interval_ms=settings.telemetry_flush_interval_ms,
+    max_buffered_rows=settings.telemetry_buffer_max_rows
+)
@@ -0,0 +1,436 @@
+# app/monitoring/zones.py
+import asyncio
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Set, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+import h3
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..flights.models import RestrictedZone
+from ..utils.geospatial import calculate_distance, EARTH_RADIUS_METERS
+from ..utils.logger import setup_logger
+from .models import Alert, OPEN_ZONE_ENTRY_CONDITION
+from .schemas import TelemetryDataCreate
+from .viewports import BBox, bbox_cover
+
+logger = setup_logger("utm.zones")
+
+AIRBORNE_STATUSES = ("airborne", "hovering")
+
+
+# Zones are indexed under about this many H3 cells each; the rest of the
+# filtering is an exact bbox check, then geodesic distance
+MAX_ZONE_COVER_CELLS = 16
+# Spherical bbox padding, so the WGS84 circle always fits inside
+ZONE_BBOX_PADDING = 1.01
+
+
+def zone_bbox(zone: RestrictedZone) -> BBox:
+    """Bounding box of the zone's circle, clipped to valid coordinates"""
+    dlat = math.degrees(zone.radius * ZONE_BBOX_PADDING / EARTH_RADIUS_METERS)
+    dlng = dlat / max(math.cos(math.radians(zone.center_lat)), 1e-6)
+    return (
+        max(zone.center_lng - dlng, -180.0),
+        max(zone.center_lat - dlat, -90.0),
+        min(zone.center_lng + dlng, 180.0),
+        min(zone.center_lat + dlat, 90.0)
+    )
+
+
+class ZoneIndex:
+    """
+    Immutable snapshot of the active restricted zones with a spatial index.
+
+    Each zone's bounding box is covered with H3 cells (at a resolution that
+    suits the zone size, like viewport bboxes) and the zone is listed under
+    every one of them. A point lookup costs one geo_to_h3 and dict lookup per
+    resolution in use, a bbox check for the zones under those cells, and a
+    geodesic distance only for the zones whose bbox contains the point.
+    """
+
+    def __init__(self, zones: List[RestrictedZone]):
+        self.zones = zones
+        self.bboxes: Dict[int, BBox] = {}
+        self._candidates: Dict[str, List[RestrictedZone]] = defaultdict(list)
+        for zone in zones:
+            bbox = self.bboxes[zone.id] = zone_bbox(zone)
+            for cell in bbox_cover(bbox, MAX_ZONE_COVER_CELLS):
+                self._candidates[cell].append(zone)
+        self.resolutions = sorted({h3.h3_get_resolution(cell) for cell in self._candidates})
+
+    def candidates(self, latitude: float, longitude: float) -> List[RestrictedZone]:
+        """Zones whose bounding box contains the point"""
+        found: Dict[int, RestrictedZone] = {}
+        for resolution in self.resolutions:
+            for zone in self._candidates.get(h3.geo_to_h3(latitude, longitude, resolution), ()):
+                if zone.id in found:
+                    continue
+                min_lng, min_lat, max_lng, max_lat = self.bboxes[zone.id]
+                if min_lng <= longitude <= max_lng and min_lat <= latitude <= max_lat:
+                    found[zone.id] = zone
+        return list(found.values())
+
+    def containing(self, latitude: float, longitude: float) -> List[RestrictedZone]:
+        return [
+            zone for zone in self.candidates(latitude, longitude)
+            if calculate_distance(latitude, longitude, zone.center_lat, zone.center_lng) <= zone.radius
+        ]
+
+    def get_stats(self):
+        return {
+            "zones": len(self.zones),
+            "indexed_cells": len(self._candidates),
+            "resolutions": self.resolutions
+        }
+
+
+class RestrictedZoneCache:
+    def __init__(self, ttl_seconds: int = 300):  # 5 minute cache
+        self.index = ZoneIndex([])
+        self.last_update = None
+        self.ttl_seconds = ttl_seconds
+        self.lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return bool(self.last_update) and (datetime.utcnow() - self.last_update).total_seconds() <= self.ttl_seconds
+
+    async def get_index(self, db: AsyncSession) -> ZoneIndex:
+        # While another task refreshes, keep using the current snapshot
+        if self.is_fresh() or (self.last_update and self.lock.locked()):
+            return self.index
+
+        async with self.lock:
+            if not self.is_fresh():
+                # Refresh cache
+                result = await db.execute(
+                    select(RestrictedZone).where(RestrictedZone.is_active == True)
+                )
+                zones = result.scalars().all()
+                start = time.perf_counter()
+                # Indexing thousands of zones takes a while, keep it off the event loop
+                self.index = await asyncio.to_thread(ZoneIndex, zones)
+                self.last_update = datetime.utcnow()
+                logger.info(
+                    f"Refreshed restricted zone cache: {len(zones)} zones, "
+                    f"{self.index.get_stats()['indexed_cells']} cells indexed in {(time.perf_counter() - start) * 1000:.0f}ms"
+                )
+
+            return self.index
+
+
+zone_cache = RestrictedZoneCache()
+
+
+def zone_violation(zone: RestrictedZone, altitude: float) -> dict:
+    if altitude > zone.max_altitude:
+        return {
+            "zone_id": zone.id,
+            "zone_name": zone.name,
+            "zone_type": "restricted",
+            "severity": "high",
+            "message": f"Drone entered restricted zone: {zone.name} (altitude: {altitude}m exceeds max: {zone.max_altitude}m)"
+        }
+    return {
+        "zone_id": zone.id,
+        "zone_name": zone.name,
+        "zone_type": "restricted",
+        "severity": "medium",
+        "message": f"Drone entered restricted zone: {zone.name}"
+    }
+
+
+# Zone entries still open (the drone hasn't left the zone), the membership seed.
+# The alert_type literal lets the planner match the open entry partial index.
+OPEN_ZONE_ENTRIES = text("""
+    SELECT drone_id, zone_id FROM alerts
+    WHERE alert_type = 'restricted_zone_violation'
+    AND exited_at IS NULL
+    AND zone_id IS NOT NULL
+""")
+
+# Open entries to close, locked in (drone_id, zone_id) order. The row lock
+# re-checks exited_at, so an entry another worker closed meanwhile is skipped.
+LOCK_OPEN_ZONE_ENTRIES = text("""
+    SELECT alerts.id
+    FROM alerts
+    JOIN unnest(CAST(:drone_ids AS integer[]), CAST(:zone_ids AS integer[])) AS exits(drone_id, zone_id)
+    ON alerts.drone_id = exits.drone_id AND alerts.zone_id = exits.zone_id
+    WHERE alerts.alert_type = 'restricted_zone_violation'
+    AND alerts.exited_at IS NULL
+    AND alerts.zone_id IS NOT NULL
+    ORDER BY alerts.drone_id, alerts.zone_id
+    FOR UPDATE OF alerts
+""")
+
+CLOSE_ZONE_ENTRIES = text("""
+    UPDATE alerts SET exited_at = now()
+    WHERE id = ANY(CAST(:alert_ids AS integer[]))
+    RETURNING drone_id, zone_id
+""")
+
+
+class ZoneMonitor:
+    """
+    Restricted zone detection on the telemetry ingest path.
+
+    Every accepted airborne sample is checked once, right after its batch
+    commits, so the work follows the telemetry rate whether or not anyone is
+    watching. Samples are taken in device time order per drone and older
+    ones than the last checked are skipped.
+
+    Zone membership is a per-drone state machine kept in memory: a drone's
+    set of zones is compared with the zones its new position is in, and only
+    transitions produce events, so a batch without any costs no query. The
+    alerts table holds the same state for every worker: a drone is inside a
+    zone while its restricted_zone_violation alert for that zone has no
+    exited_at. load() seeds the map from those open entries on startup, and
+    transitions recorded by other workers are applied as they are relayed.
+    Enter events insert an alert and exit events set exited_at (landing
+    inside a zone counts as leaving it). Both writes are guarded by the open
+    entry unique index, so when two workers see the same transition only one
+    of them raises it. Listeners get (alerts, exits) after each batch.
+    """
+
+    ALERT_TYPE = "restricted_zone_violation"
+    # How often last_checked is swept for drones that went quiet
+    PRUNE_INTERVAL_SECONDS = 60
+
+    def __init__(self, max_lateness_seconds: int):
+        self.max_lateness_seconds = max_lateness_seconds
+        # drone_id -> ids of the zones it is currently inside
+        self.membership: Dict[int, Set[int]] = {}
+        self.last_checked: Dict[int, datetime] = {}
+        self.last_pruned = time.monotonic()
+        self.listeners: List[Callable[[List[dict], List[dict]], None]] = []
+
+        self.samples_checked = 0
+        self.violations = 0
+        self.enter_events = 0
+        self.exit_events = 0
+        self.alerts_raised = 0
+        self.transitions_taken_by_others = 0
+        self.remote_transitions = 0
+        self.alert_insert_errors = 0
+        self.check_times = deque(maxlen=1000)
+
+    def add_listener(self, listener: Callable[[List[dict], List[dict]], None]):
+        self.listeners.append(listener)
+
+    async def load(self):
+        """Seed zone membership from the open zone entries in the alerts table"""
+        membership: Dict[int, Set[int]] = defaultdict(set)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(OPEN_ZONE_ENTRIES)
+            for drone_id, zone_id in result.all():
+                membership[drone_id].add(zone_id)
+        self.membership = dict(membership)
+        logger.info(f"Loaded zone membership of {len(self.membership)} drones from open zone entries")
+
+    def apply_transitions(self, entered: List[Tuple[int, int]], exited: List[Tuple[int, int]]):
+        """Zone entries and exits (drone_id, zone_id) another worker recorded"""
+        for drone_id, zone_id in entered:
+            self.membership[drone_id] = self.membership.get(drone_id, set()) | {zone_id}
+        for drone_id, zone_id in exited:
+            zone_ids = self.membership.get(drone_id, set()) - {zone_id}
+            if zone_ids:
+                self.membership[drone_id] = zone_ids
+            else:
+                self.membership.pop(drone_id, None)
+        self.remote_transitions += len(entered) + len(exited)
+
+    def prune(self):
+        """
+        Forget when drones outside every zone were last checked once that is past
+        the lateness bound; ingest refuses samples that old, so nothing is lost.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.max_lateness_seconds)
+        for drone_id in [
+            d for d, checked in self.last_checked.items() if checked < cutoff and d not in self.membership
+        ]:
+            del self.last_checked[drone_id]
+        self.last_pruned = time.monotonic()
+
+    def _restore(self, recorded: Dict[int, Set[int]]):
+        for drone_id, zone_ids in recorded.items():
+            if zone_ids:
+                self.membership[drone_id] = zone_ids
+            else:
+                self.membership.pop(drone_id, None)
+
+    async def check_samples(self, db: AsyncSession, samples: List[TelemetryDataCreate]) -> List[dict]:
+        start = time.perf_counter()
+        if time.monotonic() - self.last_pruned >= self.PRUNE_INTERVAL_SECONDS:
+            self.prune()
+        entered: Dict[Tuple[int, int], Tuple[TelemetryDataCreate, RestrictedZone]] = {}
+        exits: Dict[Tuple[int, int], dict] = {}
+        # Membership of the batch's drones before it, to undo a failed write
+        recorded: Dict[int, Set[int]] = {}
+        try:
+            index = await zone_cache.get_index(db)
+            zones_by_id = {zone.id: zone for zone in index.zones}
+
+            for sample in sorted(samples, key=lambda s: (s.drone_id, s.timestamp)):
+                last_checked = self.last_checked.get(sample.drone_id)
+                if last_checked is not None and sample.timestamp <= last_checked:
+                    continue
+                self.last_checked[sample.drone_id] = sample.timestamp
+
+                inside: Dict[int, RestrictedZone] = {}
+                if sample.status in AIRBORNE_STATUSES:
+                    self.samples_checked += 1
+                    inside = {zone.id: zone for zone in index.containing(sample.latitude, sample.longitude)}
+                    self.violations += len(inside)
+
+                previous = self.membership.get(sample.drone_id, set())
+                recorded.setdefault(sample.drone_id, previous)
+                for zone_id in inside.keys() - previous:
+                    entered.setdefault((sample.drone_id, zone_id), (sample, inside[zone_id]))
+                for zone_id in previous - inside.keys():
+                    zone = zones_by_id.get(zone_id)
+                    exits[(sample.drone_id, zone_id)] = {
+                        "drone_id": sample.drone_id,
+                        "zone_id": zone_id,
+                        "zone_name": zone.name if zone else None,
+                        "latitude": sample.latitude,
+                        "longitude": sample.longitude,
+                        "altitude": sample.altitude,
+                        "timestamp": sample.timestamp.isoformat()
+                    }
+                if inside:
+                    self.membership[sample.drone_id] = set(inside)
+                else:
+                    self.membership.pop(sample.drone_id, None)
+
+            # Only the net change per drone and zone is recorded: a drone that was
+            # inside and is inside again after leaving has no new alert, one that
+            # was outside and came and went has its entry inserted and closed
+            for drone_id, zone_id in entered.keys() | exits.keys():
+                was_inside = zone_id in recorded.get(drone_id, ())
+                is_inside = zone_id in self.membership.get(drone_id, ())
+                if was_inside:
+                    entered.pop((drone_id, zone_id), None)
+                    if is_inside:
+                        exits.pop((drone_id, zone_id), None)
+                elif is_inside:
+                    exits.pop((drone_id, zone_id), None)
+        except Exception as e:
+            logger.error(f"Error checking restricted zones: {str(e)}", exc_info=True)
+            self._restore(recorded)
+            return []
+
+        if not entered and not exits:
+            self.check_times.append((time.perf_counter() - start) * 1000)
+            return []
+
+        try:
+            alerts, exited = await self.record_transitions(db, entered, exits)
+        except Exception as e:
+            await db.rollback()
+            self.alert_insert_errors += 1
+            logger.error(f"Error recording {len(entered)} zone entries and {len(exits)} exits: {str(e)}", exc_info=True)
+            # Nothing was recorded; with the old membership the next samples retry
+            self._restore({drone_id: recorded[drone_id] for drone_id, _ in entered.keys() | exits.keys()})
+            return []
+        self.enter_events += len(alerts)
+        self.exit_events += len(exited)
+        self.check_times.append((time.perf_counter() - start) * 1000)
+
+        if alerts or exited:
+            for listener in self.listeners:
+                listener(alerts, exited)
+        return alerts
+
+    async def record_transitions(
+            self,
+            db: AsyncSession,
+            entered: Dict[Tuple[int, int], Tuple[TelemetryDataCreate, RestrictedZone]],
+            exits: Dict[Tuple[int, int], dict]
+    ) -> Tuple[List[dict], List[dict]]:
+        """
+        Insert an alert per zone entry and close the entries of zone exits, in one
+        transaction and in (drone_id, zone_id) order. Only the transitions this
+        worker actually recorded are returned; the others were already recorded
+        by another worker.
+        """
+        entries = sorted(entered.items())
+        violations = [zone_violation(zone, sample.altitude) for _, (sample, zone) in entries]
+        inserted: Dict[Tuple[int, int], int] = {}
+        if entries:
+            result = await db.execute(
+                pg_insert(Alert)
+                .on_conflict_do_nothing(
+                    index_elements=[Alert.drone_id, Alert.zone_id],
+                    index_where=OPEN_ZONE_ENTRY_CONDITION
+                )
+                .returning(Alert.id, Alert.drone_id, Alert.zone_id),
+                [
+                    {
+                        "drone_id": sample.drone_id,
+                        "flight_request_id": sample.flight_request_id,
+                        "zone_id": zone.id,
+                        "alert_type": self.ALERT_TYPE,
+                        "severity": violation["severity"],
+                        "message": violation["message"],
+                        "latitude": sample.latitude,
+                        "longitude": sample.longitude,
+                        "altitude": sample.altitude,
+                        "is_resolved": False
+                    }
+                    for (_, (sample, zone)), violation in zip(entries, violations)
+                ]
+            )
+            inserted = {(drone_id, zone_id): alert_id for alert_id, drone_id, zone_id in result.all()}
+
+        closed = set()
+        if exits:
+            keys = sorted(exits)
+            alert_ids = (await db.execute(LOCK_OPEN_ZONE_ENTRIES, {
+                "drone_ids": [drone_id for drone_id, _ in keys],
+                "zone_ids": [zone_id for _, zone_id in keys]
+            })).scalars().all()
+            if alert_ids:
+                result = await db.execute(CLOSE_ZONE_ENTRIES, {"alert_ids": list(alert_ids)})
+                closed = {(drone_id, zone_id) for drone_id, zone_id in result.all()}
+        await db.commit()
+
+        self.alerts_raised += len(inserted)
+        self.transitions_taken_by_others += len(entries) - len(inserted) + len(exits) - len(closed)
+        alerts = [
+            {
+                "alert_id": inserted[key],
+                "drone_id": sample.drone_id,
+                **violation,
+                "latitude": sample.latitude,
+                "longitude": sample.longitude,
+                "altitude": sample.altitude,
+                "timestamp": sample.timestamp.isoformat()
+            }
+            for (key, (sample, _)), violation in zip(entries, violations)
+            if key in inserted
+        ]
+        return alerts, [exits[key] for key in sorted(closed)]
+
+    def get_stats(self):
+        return {
+            "samples_checked": self.samples_checked,
+            "violations": self.violations,
+            "enter_events": self.enter_events,
+            "exit_events": self.exit_events,
+            "alerts_raised": self.alerts_raised,
+            "transitions_taken_by_others": self.transitions_taken_by_others,
+            "remote_transitions": self.remote_transitions,
+            "alert_insert_errors": self.alert_insert_errors,
+            "drones_in_zones": len(self.membership),
+            "tracked_drones": len(self.last_checked),
+            "zone_index": zone_cache.index.get_stats(),
+            "avg_batch_check_ms": sum(self.check_times) / len(self.check_times) if self.check_times else 0
+        }
+
+
+zone_monitor = ZoneMonitor(settings.telemetry_max_lateness_seconds)
@@ -42,6 +42,24 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Spherical great circle distance in meters.
+
+    Much cheaper than calculate_distance and accurate to well under a percent,
+    which is enough for per-sample threshold checks on the ingest path.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
 def point_in_circle(point_lat: float, point_lon: float,
                     center_lat: float, center_lon: float, radius: float) -> bool:
     """
@@ -0,0 +1,91 @@
+# app/utils/track_simplify.py
+import heapq
+import math
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Web Mercator ground resolution at zoom 0 on the equator, meters per pixel
+EQUATOR_METERS_PER_PIXEL = 156543.03392
+
+METERS_PER_DEGREE_LAT = 110540.0
+METERS_PER_DEGREE_LNG = 111320.0
+
+
+def meters_per_pixel(zoom: float, latitude: float) -> float:
+    """Ground distance covered by one map pixel at a zoom level and latitude"""
+    return EQUATOR_METERS_PER_PIXEL * math.cos(math.radians(latitude)) / (2 ** zoom)
+
+
+def project_to_meters(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Equirectangular projection around the track's mean latitude. Distortion is
+    negligible over a city-sized track, and it keeps distances in meters.
+    """
+    ref_lat = float(np.mean(latitudes)) if len(latitudes) else 0.0
+    x = longitudes * METERS_PER_DEGREE_LNG * math.cos(math.radians(ref_lat))
+    y = latitudes * METERS_PER_DEGREE_LAT
+    return np.column_stack((x, y))
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distance of every point to the segment start-end, vectorized over points"""
+    direction = end - start
+    length_sq = float(direction @ direction)
+    if length_sq == 0.0:
+        return np.linalg.norm(points - start, axis=1)
+    t = np.clip((points - start) @ direction / length_sq, 0.0, 1.0)
+    return np.linalg.norm(points - (start + t[:, None] * direction), axis=1)
+
+
+def _farthest_point(points: np.ndarray, start: int, end: int) -> Tuple[int, float]:
+    distances = _segment_distances(points[start + 1:end], points[start], points[end])
+    offset = int(np.argmax(distances))
+    return start + 1 + offset, float(distances[offset])
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float, max_points: Optional[int] = None) -> np.ndarray:
+    """
+    Douglas-Peucker over an (n, 2) array in meters, returning sorted indices to keep.
+
+    Segments are split at their farthest point while it deviates by more than
+    tolerance. Splits are taken largest deviation first from a heap, so with
+    max_points the most significant points are kept and the work stops as soon
+    as the budget is reached. Distances for each segment are computed in one
+    vectorized pass.
+    """
+    n = len(points)
+    if n <= 2:
+        return np.arange(n)
+
+    keep = [0, n - 1]
+    heap: List[Tuple[float, int, int, int]] = []
+
+    def split(start: int, end: int):
+        if end - start < 2:
+            return
+        index, distance = _farthest_point(points, start, end)
+        if distance > tolerance:
+            heapq.heappush(heap, (-distance, start, end, index))
+
+    split(0, n - 1)
+    while heap and (max_points is None or len(keep) < max_points):
+        _, start, end, index = heapq.heappop(heap)
+        keep.append(index)
+        split(start, index)
+        split(index, end)
+    return np.sort(np.array(keep))
+
+
+def simplify_track(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    tolerance_m: Optional[float] = None,
+    max_points: Optional[int] = None
+) -> np.ndarray:
+    """
+    Indices (ascending) of the track points to keep. With tolerance_m, points whose
+    removal moves the line by less than tolerance_m are dropped; with max_points,
+    the most significant points are kept up to the budget. Both may be combined.
+    """
+    points = project_to_meters(latitudes, longitudes)
+    return douglas_peucker(points, tolerance_m or 0.0, max_points)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from app.utils.track_simplify import _segment_distances, douglas_peucker
+
+
+def max_deviation(points, keep):
+    """Largest distance of any point to the simplified polyline over its span"""
+    worst = 0.0
+    for start, end in zip(keep[:-1], keep[1:]):
+        if end - start > 1:
+            distances = _segment_distances(points[start + 1:end], points[start], points[end])
+            worst = max(worst, float(distances.max()))
+    return worst
+
+
+def test_short_tracks_are_kept_whole():
+    assert douglas_peucker(np.zeros((0, 2)), 1.0).tolist() == []
+    assert douglas_peucker(np.array([[0.0, 0.0]]), 1.0).tolist() == [0]
+    assert douglas_peucker(np.array([[0.0, 0.0], [5.0, 5.0]]), 1.0).tolist() == [0, 1]
+
+
+def test_straight_line_keeps_only_endpoints():
+    points = np.column_stack((np.linspace(0, 1000, 50), np.zeros(50)))
+    assert douglas_peucker(points, 0.5).tolist() == [0, 49]
+
+
+def test_deviation_above_tolerance_is_kept():
+    points = np.array([[0.0, 0.0], [50.0, 5.2], [100.0, 10.0], [150.0, 0.0], [200.0, 0.0]])
+    keep = douglas_peucker(points, 1.0).tolist()
+    assert 2 in keep
+    assert 1 not in keep
+
+
+def test_endpoints_and_tolerance_hold_on_random_tracks():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        points = np.cumsum(rng.normal(0, 20, size=(200, 2)), axis=0)
+        for tolerance in (0.0, 5.0, 50.0):
+            keep = douglas_peucker(points, tolerance)
+            assert keep[0] == 0 and keep[-1] == len(points) - 1
+            assert (np.diff(keep) > 0).all()
+            assert max_deviation(points, keep) <= tolerance
+
+
+def test_max_points_caps_the_result():
+    rng = np.random.default_rng(1)
+    points = np.cumsum(rng.normal(0, 20, size=(500, 2)), axis=0)
+    keep = douglas_peucker(points, 0.0, max_points=30)
+    assert len(keep) == 30
+    assert keep[0] == 0 and keep[-1] == len(points) - 1
@@ -0,0 +1,60 @@
+import random
+
+import h3
+import pytest
+
+from app.monitoring.viewports import bbox_cover
+
+BBOXES = [
+    (-180, -90, 180, 90),
+    (-100, -60, 100, 60),
+    (-30, 20, 170, 70),
+    (-179, -89, 179, 89),
+    (-180, 80, 180, 90),
+    (0, -90, 10, -80),
+    (170, -10, 180, 10),
+    (-180, -10, -170, 10),
+    (179.9, 50, 180, 51),
+    (60, 40, 80, 60),
+    (71.3, 51.0, 71.6, 51.3),
+]
+
+
+def is_covered(cover, latitude, longitude):
+    resolutions = {h3.h3_get_resolution(cell) for cell in cover}
+    return any(h3.geo_to_h3(latitude, longitude, resolution) in cover for resolution in resolutions)
+
+
+@pytest.mark.parametrize("bbox", BBOXES)
+def test_bbox_cover_contains_every_point(bbox):
+    min_lng, min_lat, max_lng, max_lat = bbox
+    cover = bbox_cover(bbox)
+    rng = random.Random(0)
+    points = [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(2000)]
+    # Corners and edge midpoints are where a cover is most likely to fall short
+    points += [(lat, lng) for lat in (min_lat, max_lat, (min_lat + max_lat) / 2)
+               for lng in (min_lng, max_lng, (min_lng + max_lng) / 2)]
+    missed = [point for point in points if not is_covered(cover, *point)]
+    assert missed == []
+
+
+def test_world_bbox_covers_astana():
+    assert is_covered(bbox_cover((-180, -90, 180, 90)), 51.1694, 71.4491)
+
+
+def test_bbox_cover_stays_bounded():
+    for bbox in BBOXES:
+        assert len(bbox_cover(bbox)) <= 1000
+
+
+def test_random_bboxes_are_covered():
+    rng = random.Random(1)
+    for _ in range(40):
+        width, height = rng.choice((0.01, 0.5, 10, 120, 300)), rng.choice((0.01, 0.5, 10, 60))
+        min_lng = rng.uniform(-180, 180 - min(width, 359.9))
+        min_lat = rng.uniform(-90, 90 - height)
+        bbox = (min_lng, min_lat, min(min_lng + width, 180), min_lat + height)
+        cover = bbox_cover(bbox)
+        for _ in range(200):
+            point = (rng.uniform(bbox[1], bbox[3]), rng.uniform(bbox[0], bbox[2]))
+            assert is_covered(cover, *point), (bbox, point)
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.monitoring.schemas import TelemetryDataCreate
+from app.monitoring.wire_format import (
+    MAX_TIMESTAMP_MS,
+    TELEMETRY_RECORD_DTYPE,
+    TELEMETRY_RECORD_SIZE,
+    WireFormatError,
+    decode_telemetry_records,
+    encode_telemetry_records,
+)
+
+
+def sample(**overrides):
+    fields = dict(
+        drone_id=7,
+        flight_request_id=42,
+        latitude=51.169392,
+        longitude=71.449074,
+        altitude=120.5,
+        speed=12.25,
+        heading=270.0,
+        battery_level=87.5,
+        status="hovering",
+        timestamp=datetime(2026, 10, 16, 12, 30, 15, 123000, tzinfo=timezone.utc)
+    )
+    fields.update(overrides)
+    return TelemetryDataCreate(**fields)
+
+
+def test_record_size_is_fixed():
+    assert TELEMETRY_RECORD_SIZE == 52
+    assert len(encode_telemetry_records([sample(), sample()])) == 2 * TELEMETRY_RECORD_SIZE
+
+
+def test_round_trip_keeps_every_field():
+    original = [sample(), sample(drone_id=8, flight_request_id=None, status="emergency", timestamp=None)]
+    decoded = decode_telemetry_records(encode_telemetry_records(original))
+
+    assert len(decoded) == 2
+    for before, after in zip(original, decoded):
+        assert after.drone_id == before.drone_id
+        assert after.flight_request_id == before.flight_request_id
+        assert after.status == before.status
+        assert after.timestamp == before.timestamp
+        # Coordinates travel as float64, the rest as float32
+        assert after.latitude == before.latitude
+        assert after.longitude == before.longitude
+        for field in ("altitude", "speed", "heading", "battery_level"):
+            assert getattr(after, field) == pytest.approx(getattr(before, field), rel=1e-6)
+
+
+def test_empty_payload_decodes_to_nothing():
+    assert decode_telemetry_records(b"") == []
+
+
+def test_truncated_payload_is_rejected():
+    with pytest.raises(WireFormatError):
+        decode_telemetry_records(encode_telemetry_records([sample()])[:-1])
+
+
+def test_unknown_status_code_is_rejected():
+    records = np.frombuffer(encode_telemetry_records([sample()]), dtype=TELEMETRY_RECORD_DTYPE).copy()
+    records["status"] = 200
+    with pytest.raises(WireFormatError):
+        decode_telemetry_records(records.tobytes())
+
+
+@pytest.mark.parametrize("timestamp_ms", [-1, MAX_TIMESTAMP_MS + 1])
+def test_out_of_range_timestamp_is_rejected(timestamp_ms):
+    records = np.frombuffer(encode_telemetry_records([sample()]), dtype=TELEMETRY_RECORD_DTYPE).copy()
+    records["timestamp_ms"] = timestamp_ms
+    with pytest.raises(WireFormatError):
+        decode_telemetry_records(records.tobytes())
+
+
+def test_status_without_wire_code_is_rejected():
+    with pytest.raises(WireFormatError):
+        encode_telemetry_records([sample(status="parked")])
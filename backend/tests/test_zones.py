@@ -0,0 +1,49 @@
+import random
+
+from app.flights.models import RestrictedZone
+from app.monitoring.zones import ZoneIndex
+from app.utils.geospatial import calculate_distance
+
+
+def random_zones(rng, count):
+    zones = []
+    for zone_id in range(1, count + 1):
+        zones.append(RestrictedZone(
+            id=zone_id,
+            name=f"zone {zone_id}",
+            center_lat=rng.uniform(50.9, 51.4),
+            center_lng=rng.uniform(71.1, 71.8),
+            # From a few rooftops to a whole district
+            radius=rng.choice((50, 500, 5000, 20000)) * rng.uniform(0.5, 1.5),
+            max_altitude=100.0,
+            is_active=True
+        ))
+    return zones
+
+
+def test_containing_matches_brute_force():
+    rng = random.Random(0)
+    zones = random_zones(rng, 60)
+    index = ZoneIndex(zones)
+    for _ in range(3000):
+        latitude, longitude = rng.uniform(50.8, 51.5), rng.uniform(71.0, 71.9)
+        expected = {
+            zone.id for zone in zones
+            if calculate_distance(latitude, longitude, zone.center_lat, zone.center_lng) <= zone.radius
+        }
+        assert {zone.id for zone in index.containing(latitude, longitude)} == expected
+
+
+def test_points_on_the_zone_edge_are_found():
+    rng = random.Random(1)
+    zones = random_zones(rng, 20)
+    index = ZoneIndex(zones)
+    for zone in zones:
+        # Just inside the circle, straight north and east of the center
+        dlat = zone.radius * 0.999 / 111320
+        for latitude, longitude in ((zone.center_lat + dlat, zone.center_lng), (zone.center_lat, zone.center_lng)):
+            assert zone.id in {found.id for found in index.containing(latitude, longitude)}
+
+
+def test_empty_index_finds_nothing():
+    assert ZoneIndex([]).containing(51.17, 71.45) == []